@@ -0,0 +1,297 @@
+import io
+import numpy as np
+from PIL import Image, GifImagePlugin
+
+def figure_frames(fig,animate,n_frames,init=None):
+    """
+    Draw a matplotlib animation frame by frame on the figure's own Agg
+    canvas, without going through matplotlib.animation.
+
+    Parameters
+    ----------
+    fig: Figure
+        figure with an Agg canvas
+    animate: callable
+        animate(i) updates the artists for frame i, as for FuncAnimation
+    n_frames: int
+        number of frames to draw
+    init: callable, optional
+        called once before the first frame, as FuncAnimation's init_func
+
+    Yields
+    ------
+    (H,W,4) uint8 RGBA array for each frame. It is a view of the
+    canvas buffer, so it is only valid until the next frame is drawn.
+    """
+    if init is not None:
+        init()
+    for i in range(n_frames):
+        animate(i)
+        fig.canvas.draw()
+        yield np.asarray(fig.canvas.buffer_rgba())
+
+def _artist_list(artists):
+    if artists is None:
+        return []
+    if isinstance(artists,dict):
+        return list(artists.values())
+    return list(artists)
+
+def blit_frames(fig,animate,n_frames,init=None):
+    """
+    Like figure_frames, but the static part of the figure is rendered
+    only once. Each frame restores that cached Agg background and draws
+    just the artists animate(i) returns, in z-order.
+
+    Parameters
+    ----------
+    fig: Figure
+        figure with an Agg canvas
+    animate: callable
+        animate(i) updates frame i and returns the changed artists,
+        as a dict of artists or an iterable of artists
+    n_frames: int
+        number of frames to draw
+    init: callable, optional
+        called once before the first frame, returns the artists that
+        will change from frame to frame
+
+    Yields
+    ------
+    (H,W,4) uint8 RGBA array for each frame, a view of the canvas
+    buffer that is only valid until the next frame is drawn.
+    """
+    canvas = fig.canvas
+    moving = _artist_list(init()) if init is not None else []
+    # animated artists are left out of a full draw
+    for artist in moving:
+        artist.set_animated(True)
+    canvas.draw()
+    background = canvas.copy_from_bbox(fig.bbox)
+
+    for i in range(n_frames):
+        changed = _artist_list(animate(i))
+        canvas.restore_region(background)
+        for artist in sorted(changed,key=lambda artist: artist.get_zorder()):
+            if not artist.get_animated():
+                artist.set_animated(True)
+            fig.draw_artist(artist)
+        yield np.asarray(canvas.buffer_rgba())
+
+def encode_gif(frames,fps,loop=0,colors=16):
+    """
+    Encode frames as an animated GIF in memory.
+
+    All frames are quantized to one palette computed from the first
+    frame, so the palette is derived only once and stored only once.
+
+    Parameters
+    ----------
+    frames: iterable of uint8 arrays
+        (H,W,4) RGBA, (H,W,3) RGB or (H,W) grayscale frames
+    fps: float
+        frames per second
+    loop: int
+        number of times to loop, 0 loops forever
+    colors: int
+        size of the shared palette
+
+    Returns
+    -------
+    bytes of the GIF file, which st.image accepts directly
+    """
+    palette = None
+    images = []
+    for frame in frames:
+        image = Image.fromarray(np.asarray(frame)).convert('RGB')
+        if palette is None:
+            palette = image.quantize(colors=colors,method=Image.MEDIANCUT)
+        images.append(image.quantize(palette=palette,dither=Image.NONE))
+
+    buffer = io.BytesIO()
+    images[0].save(buffer,format='GIF',
+        save_all=True,append_images=images[1:],
+        duration=int(round(1000./fps)),loop=loop,
+        optimize=False,
+    )
+    return buffer.getvalue()
+
+def encode_gif_delta(frames,fps,boxes,loop=0,colors=16):
+    """
+    Encode frames as an animated GIF in memory, storing only the
+    given box of each frame after the first.
+
+    Each partial frame is drawn over the previous one (disposal method
+    1, do not dispose), so the animation looks exactly as encode_gif's.
+    Only the boxes are quantized and compressed, and no frame has to be
+    compared with the one before, as Pillow otherwise does to find
+    what changed. All frames share the first frame's palette as the
+    GIF's global color table.
+
+    Parameters
+    ----------
+    frames: sequence of uint8 arrays
+        (H,W,4) RGBA, (H,W,3) RGB or (H,W) grayscale frames
+    fps: float
+        frames per second
+    boxes: array of shape (n_frames,4)
+        (left,upper,right,lower) pixel box of each frame that holds
+        everything that changed since the frame before, e.g. from
+        rasterizer.dirty_boxes; the first frame is stored whole and
+        its box is ignored, and an empty box adds its frame's time to
+        the frame before
+    loop: int
+        number of times to loop, 0 loops forever
+    colors: int
+        size of the shared palette
+
+    Returns
+    -------
+    bytes of the GIF file
+    """
+    duration = int(round(1000./fps))
+    palette = None
+    header = []
+    # [image,offset,duration] of every frame that is stored
+    stored = []
+    for frame,box in zip(frames,boxes):
+        frame = np.asarray(frame)
+        if palette is None:
+            # the first frame is always stored whole, whatever its box
+            image = Image.fromarray(frame).convert('RGB')
+            palette = image.quantize(colors=colors,method=Image.MEDIANCUT)
+            image = image.quantize(palette=palette,dither=Image.NONE)
+            header,_ = GifImagePlugin.getheader(image,info=dict(loop=loop,duration=duration))
+            stored.append([image,(0,0),duration])
+            continue
+        left,upper,right,lower = (int(x) for x in box)
+        if right <= left or lower <= upper:
+            # nothing changed, show the previous frame for longer
+            stored[-1][2] += duration
+            continue
+        image = Image.fromarray(frame[upper:lower,left:right]).convert('RGB')
+        stored.append([image.quantize(palette=palette,dither=Image.NONE),(left,upper),duration])
+
+    chunks = list(header)
+    for image,offset,frame_duration in stored:
+        chunks.extend(GifImagePlugin.getdata(image,offset=offset,
+            duration=frame_duration,disposal=1))
+    chunks.append(b';')
+    return b''.join(chunks)
+
+def _frame_images(frames,mode=None):
+    # copy every frame out of its buffer, keeping grayscale frames
+    # grayscale unless mode says otherwise
+    images = []
+    for frame in frames:
+        image = Image.fromarray(np.asarray(frame))
+        images.append(image.convert(mode or ('L' if image.mode == 'L' else 'RGB')))
+    return images
+
+def encode_webp(frames,fps,loop=0,quality=80,method=4,lossless=False):
+    """
+    Encode frames as an animated WebP in memory.
+
+    Parameters
+    ----------
+    frames: iterable of uint8 arrays
+        (H,W,4) RGBA, (H,W,3) RGB or (H,W) grayscale frames
+    fps: float
+        frames per second
+    loop: int
+        number of times to loop, 0 loops forever
+    quality: int
+        0 to 100; for lossy files the image quality, for lossless
+        ones how hard to try to compress
+    method: int
+        0 to 6, trading encoding speed for smaller files
+    lossless: bool
+        encode losslessly
+
+    Returns
+    -------
+    bytes of the WebP file
+    """
+    images = _frame_images(frames,'RGB')
+    buffer = io.BytesIO()
+    images[0].save(buffer,format='WEBP',
+        save_all=True,append_images=images[1:],
+        duration=int(round(1000./fps)),loop=loop,
+        quality=quality,method=method,lossless=lossless,
+    )
+    return buffer.getvalue()
+
+def encode_apng(frames,fps,loop=0,compress_level=6):
+    """
+    Encode frames as an animated PNG in memory. Grayscale frames are
+    stored as grayscale.
+
+    Parameters
+    ----------
+    frames: iterable of uint8 arrays
+        (H,W,4) RGBA, (H,W,3) RGB or (H,W) grayscale frames
+    fps: float
+        frames per second
+    loop: int
+        number of times to loop, 0 loops forever
+    compress_level: int
+        zlib level from 0 to 9, trading encoding speed for smaller files
+
+    Returns
+    -------
+    bytes of the PNG file
+    """
+    images = _frame_images(frames)
+    buffer = io.BytesIO()
+    images[0].save(buffer,format='PNG',
+        save_all=True,append_images=images[1:],
+        duration=int(round(1000./fps)),loop=loop,
+        compress_level=compress_level,
+    )
+    return buffer.getvalue()
+
+ENCODERS = {
+    'gif': encode_gif,
+    'webp': encode_webp,
+    'apng': encode_apng,
+}
+
+# default settings per format, which encode_animation's options override
+FORMAT_OPTIONS = {
+    'gif': dict(colors=16),
+    'webp': dict(quality=80,method=4,lossless=False),
+    'apng': dict(compress_level=6),
+}
+
+MIME_TYPES = {
+    'gif': 'image/gif',
+    'webp': 'image/webp',
+    'apng': 'image/apng',
+}
+
+def encode_animation(frames,fps,format='gif',loop=0,**options):
+    """
+    Encode frames as an animation in any of the ENCODERS formats.
+
+    Parameters
+    ----------
+    frames: iterable of uint8 arrays
+        (H,W,4) RGBA, (H,W,3) RGB or (H,W) grayscale frames
+    fps: float
+        frames per second
+    format: str
+        'gif', 'webp' or 'apng'
+    loop: int
+        number of times to loop, 0 loops forever
+    options:
+        settings of that format's encoder, on top of FORMAT_OPTIONS
+
+    Returns
+    -------
+    bytes of the file
+    """
+    if format not in ENCODERS:
+        raise ValueError('unknown animation format {!r}, expected one of {}'.format(
+            format,', '.join(ENCODERS)))
+    options = dict(FORMAT_OPTIONS[format],**options)
+    return ENCODERS[format](frames,fps,loop=loop,**options)
@@ -1,7 +1,7 @@
 import numpy as np
 import binary
-from matplotlib import pyplot as plt
 from matplotlib.patches import Ellipse,Circle
+from matplotlib.collections import EllipseCollection
 
 class BinaryBlackHole:
 
@@ -40,45 +40,201 @@ class BinaryBlackHole:
         self.facecolor='black',
         self.artists = {}
 
+        self.key1 = '{}_m1'.format(self.name)
+        self.key2 = '{}_m2'.format(self.name)
+        self._centers1 = self._centers2 = None
+        self._zorders1 = self._zorders2 = None
+
+    def bind(self):
+        """
+        Precompute the per-frame centers and z-orders of both black
+        holes from the binary's stored trajectory, so that each frame
+        update is a lookup.
+        """
+        pos1 = self.binary.pos1_projected
+        pos2 = self.binary.pos2_projected
+        self._centers1 = pos1[:,1:]
+        self._centers2 = pos2[:,1:]
+        # make sure star that is closer is shown on top of the other
+        self._zorders1 = np.where(pos1[:,0] > pos2[:,0],2,1)
+        self._zorders2 = 3 - self._zorders1
+
     def setup_artists(self):
-        z1,x1,y1 = self.binary.pos1_projected[0,:]
-        z2,x2,y2 = self.binary.pos2_projected[0,:]
-        self.artists['{}_m1'.format(self.name)] = self.ax.add_artist(
-            Circle((x1,y1), radius=self.BH_scale*self.binary.m1,
+        if self.binary.n_frames:
+            pos1 = self.binary.pos1_projected[0,:]
+            pos2 = self.binary.pos2_projected[0,:]
+        else:
+            # streamed binaries have no stored frames yet
+            pos1 = pos2 = np.zeros(3)
+        self.bind()
+        self.artists[self.key1] = self.ax.add_artist(
+            Circle(pos1[1:], radius=self.BH_scale*self.binary.m1,
                 edgecolor='white',
                 facecolor='black'
             )
         )
-        self.artists['{}_m2'.format(self.name)] = self.ax.add_artist(
-            Circle((x2,y2), radius=self.BH_scale*self.binary.m2,
+        self.artists[self.key2] = self.ax.add_artist(
+            Circle(pos2[1:], radius=self.BH_scale*self.binary.m2,
                 edgecolor='white',
                 facecolor='black'
             )
         )
+        return self.update(pos1,pos2)
+
+    def update(self,pos1,pos2):
+        """
+        Move the artists to the given projected positions.
+
+        Parameters
+        ----------
+        pos1,pos2: arrays of length 3
+            projected (z,x,y) positions of the primary and secondary
+        """
+        z1,x1,y1 = pos1
+        z2,x2,y2 = pos2
+        self.artists[self.key1].set_center((x1,y1))
+        self.artists[self.key2].set_center((x2,y2)) 
+
         # make sure star that is closer is shown on top of the other
         if z1 > z2:
             zorder_1, zorder_2 = 2, 1
         else:
             zorder_1, zorder_2 = 1, 2
-        self.artists['{}_m1'.format(self.name)].set_zorder(zorder_1)
-        self.artists['{}_m2'.format(self.name)].set_zorder(zorder_2)
+        self.artists[self.key1].set_zorder(zorder_1)
+        self.artists[self.key2].set_zorder(zorder_2)
 
         return self.artists
 
     def get_artists(self,i):
-        z1,x1,y1 = self.binary.pos1_projected[i,:]
-        z2,x2,y2 = self.binary.pos2_projected[i,:]
-        self.artists['{}_m1'.format(self.name)].set_center((x1,y1))
-        self.artists['{}_m2'.format(self.name)].set_center((x2,y2)) 
+        if i >= len(self._centers1):
+            # the binary was evolved further after binding
+            self.bind()
+        self.artists[self.key1].set_center(self._centers1[i])
+        self.artists[self.key2].set_center(self._centers2[i])
+        self.artists[self.key1].set_zorder(self._zorders1[i])
+        self.artists[self.key2].set_zorder(self._zorders2[i])
+        return self.artists
 
-        # make sure star that is closer is shown on top of the other
-        if z1 > z2:
-            zorder_1, zorder_2 = 2, 1
-        else:
-            zorder_1, zorder_2 = 1, 2
-        self.artists['{}_m1'.format(self.name)].set_zorder(zorder_1)
-        self.artists['{}_m2'.format(self.name)].set_zorder(zorder_2)
+    def iter_artists(self,frames):
+        """
+        Update the artists frame by frame from a stream of position
+        blocks, such as Binary.iter_frames(). The result can be passed
+        as frames to matplotlib.animation.FuncAnimation.
+
+        Parameters
+        ----------
+        frames: iterable of (pos1_proj,pos2_proj) blocks
+
+        Yields
+        ------
+        dict of the updated artists, once per frame
+        """
+        for pos1_block,pos2_block in frames:
+            for pos1,pos2 in zip(pos1_block,pos2_block):
+                yield self.update(pos1,pos2)
+
+def _set_ellipse_sizes(collection,widths,heights):
+    # EllipseCollection.set_widths and set_heights arrived in matplotlib 3.6
+    if hasattr(collection,'set_widths'):
+        collection.set_widths(widths)
+        collection.set_heights(heights)
+    else:
+        collection._widths = 0.5*np.asarray(widths).ravel()
+        collection._heights = 0.5*np.asarray(heights).ravel()
+        collection.stale = True
+
+class BinaryBlackHoleScene:
+
+    """
+    The matplotlib artist for a whole population of binary black holes,
+    with every black hole drawn by a single EllipseCollection.
+    """
+
+    def __init__(self,
+        population,
+        ax,
+        name,
+        BH_scale = 1,
+        centers = None,
+    ):
+        """
+        Parameters
+        ----------
+        population: BinaryPopulation
+            An evolved BinaryPopulation object
+        ax: axis object
+            The matplotlib axis to plot the artist on
+        name: str
+            unique name of the scene for identification
+        BH_scale: float
+            scale of BH on image WRT BH mass in solar masses
+        centers: array of shape (n_binaries,2), optional
+            where to place each binary on the axis, all at the origin
+            by default
+
+        Returns
+        -------
+        None
+        """
+        self.population = population
+        self.ax = ax
+        self.name = name
+        self.BH_scale = BH_scale
+        if centers is None:
+            centers = np.zeros((len(population),2))
+        self.centers = np.asarray(centers,dtype=float)
+        self.artists = {}
+
+        self.key = '{}_bodies'.format(self.name)
+        self._offsets = self._diameters = None
+
+    def bind(self):
+        """
+        Precompute the offsets and diameters of every black hole in
+        every frame, sorted back to front, from the population's
+        stored trajectories, so that each frame update is a lookup.
+        """
+        # all bodies as one (n_frames,2*n_binaries,3) array,
+        # primaries first
+        pos = np.concatenate((
+            self.population.pos1_projected,
+            self.population.pos2_projected
+        )).swapaxes(0,1)
+        diameters = 2.*self.BH_scale*np.concatenate((
+            self.population.m1,self.population.m2
+        ))
+        centers = np.concatenate((self.centers,self.centers))
 
+        # collections draw in order, so the closest black holes go last
+        order = np.argsort(pos[...,0],axis=1,kind='stable')
+        self._offsets = (np.take_along_axis(pos[...,1:],order[...,None],axis=1)
+                         + centers[order])
+        self._diameters = diameters[order]
+
+    def setup_artists(self):
+        self.bind()
+        n_bodies = 2*len(self.population)
+        self.artists[self.key] = self.ax.add_collection(
+            EllipseCollection(
+                np.ones(n_bodies),np.ones(n_bodies),np.zeros(n_bodies),
+                units='xy',
+                offsets=np.zeros((n_bodies,2)),
+                transOffset=self.ax.transData,
+                edgecolor='white',
+                facecolor='black'
+            )
+        )
+        if len(self._offsets):
+            return self.get_artists(0)
+        return self.artists
+
+    def get_artists(self,i):
+        if i >= len(self._offsets):
+            # the population was evolved further after binding
+            self.bind()
+        collection = self.artists[self.key]
+        collection.set_offsets(self._offsets[i])
+        _set_ellipse_sizes(collection,self._diameters[i],self._diameters[i])
         return self.artists
 
 class BlackHoleRingdown:
@@ -99,6 +255,7 @@ class BlackHoleRingdown:
         self.name = name
         self.artists = {}
         self.BH_scale = BH_scale
+        self._heights = self._widths = None
 
     def amplitude(self,i):
         return self._amplitude0 * np.exp(-i/self.tau) * np.cos(2.*2.*np.pi*i/self.tau)
@@ -106,6 +263,16 @@ class BlackHoleRingdown:
     def get_height_width(self,i):
         return 1 + self.amplitude(i), 1 - self.amplitude(i) 
 
+    def bind(self,n_frames):
+        """
+        Precompute the damped oscillation of the ellipse's height and
+        width for n_frames frames as arrays, so that each frame update
+        is a lookup instead of an np.exp and np.cos call.
+        """
+        amplitude = self.amplitude(np.arange(n_frames))
+        self._heights = self.BH_scale*self.M*(1 + amplitude)
+        self._widths = self.BH_scale*self.M*(1 - amplitude)
+
     def setup_artists(self):
         height,width = self.get_height_width(0)
         self.artists['{}_ringdown'.format(self.name)] = self.ax.add_artist(
@@ -117,6 +284,10 @@ class BlackHoleRingdown:
         return self.artists
 
     def get_artists(self,i):
+        if self._heights is not None and i < len(self._heights):
+            self.artists['{}_ringdown'.format(self.name)].height = self._heights[i]
+            self.artists['{}_ringdown'.format(self.name)].width = self._widths[i]
+            return self.artists
         height,width = self.get_height_width(i)
         self.artists['{}_ringdown'.format(self.name)].height = self.BH_scale*self.M*height
         self.artists['{}_ringdown'.format(self.name)].width = self.BH_scale*self.M*width
@@ -0,0 +1,178 @@
+"""
+Benchmarks for the orbit engine in binary.py.
+
+Times Binary.evolve, Binary.project, InspiralingBinary.inspiral and the
+pos*_projected properties over a range of frame counts and masses, and
+reports the cost per frame and the peak memory of each kernel.
+
+    python benchmarks.py                          # run and print
+    python benchmarks.py --save benchmarks.json   # store as a baseline
+    python benchmarks.py --compare benchmarks.json --threshold 0.25
+
+In compare mode the exit status is 1 if any kernel got slower than the
+baseline by more than the threshold (a fraction, 0.25 = 25%).
+"""
+
+import sys
+import json
+import time
+import argparse
+import platform
+import tracemalloc
+import numpy as np
+
+import binary
+
+FRAME_COUNTS = [60,240,1000,10000,100000]
+# the stepwise reference paths are too slow to run at every size
+STEPWISE_MAX_FRAMES = 10000
+INSPIRAL_MASSES = [(5.,5.),(10.,10.),(20.,20.),(50.,50.)]
+INSPIRAL_OMEGA0 = 5.
+
+def measure(setup,run,repeat=5):
+    """
+    Time run(setup()) and trace its memory.
+
+    Returns
+    -------
+    seconds: float
+        best wall time over repeat runs, each on a fresh setup()
+    peak_bytes: int
+        peak memory allocated by one traced run
+    """
+    times = []
+    for _ in range(repeat):
+        state = setup()
+        t0 = time.perf_counter()
+        run(state)
+        times.append(time.perf_counter() - t0)
+
+    state = setup()
+    tracemalloc.start()
+    run(state)
+    _,peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(times),peak
+
+def evolved_binary(n_frames):
+    b = binary.Binary(m1=20.,m2=20.,alpha=50.,beta=20.,gamma=95.,
+                      omega=1.,frame_rate=30.)
+    b.evolve(n_frames)
+    return b
+
+def inspiraling_binary(m1,m2):
+    return binary.InspiralingBinary(m1=m1,m2=m2,omega0=INSPIRAL_OMEGA0)
+
+def kernels():
+    """
+    yields (name, n_frames, setup, run) for every benchmark case
+    """
+    for n in FRAME_COUNTS:
+        yield ('evolve[n={}]'.format(n),n,
+               lambda: binary.Binary(),
+               lambda b,n=n: b.evolve(n))
+        if n <= STEPWISE_MAX_FRAMES:
+            yield ('evolve_stepwise[n={}]'.format(n),n,
+                   lambda: binary.Binary(),
+                   lambda b,n=n: b.evolve(n,batched=False))
+            yield ('project[n={}]'.format(n),n,
+                   lambda: binary.Binary(),
+                   lambda b,n=n: [b.project() for _ in range(n)])
+        yield ('project_phases[n={}]'.format(n),n,
+               lambda n=n: (binary.Binary(),np.linspace(0.,2.*np.pi,n)),
+               lambda state: state[0].project_phases(state[1]))
+        # 100 reads of each property from an evolved history
+        yield ('pos_projected[n={}]'.format(n),n,
+               lambda n=n: evolved_binary(n),
+               lambda b: [(b.pos1_projected,b.pos2_projected) for _ in range(100)])
+
+    for m1,m2 in INSPIRAL_MASSES:
+        probe = inspiraling_binary(m1,m2)
+        probe.inspiral()
+        adaptive_probe = inspiraling_binary(m1,m2)
+        adaptive_probe.inspiral(max_dphase=0.2)
+        yield ('inspiral[m={:g}+{:g}]'.format(m1,m2),probe.nframes,
+               lambda m1=m1,m2=m2: inspiraling_binary(m1,m2),
+               lambda b: b.inspiral())
+        yield ('inspiral_adaptive[m={:g}+{:g}]'.format(m1,m2),adaptive_probe.nframes,
+               lambda m1=m1,m2=m2: inspiraling_binary(m1,m2),
+               lambda b: b.inspiral(max_dphase=0.2))
+        if probe.nframes <= STEPWISE_MAX_FRAMES:
+            yield ('inspiral_stepwise[m={:g}+{:g}]'.format(m1,m2),probe.nframes,
+                   lambda m1=m1,m2=m2: inspiraling_binary(m1,m2),
+                   lambda b: b.inspiral(batched=False))
+
+def run_benchmarks(repeat=5,pattern=None):
+    results = {}
+    for name,n_frames,setup,run in kernels():
+        if pattern is not None and pattern not in name:
+            continue
+        seconds,peak = measure(setup,run,repeat=repeat)
+        results[name] = {
+            'n_frames': int(n_frames),
+            'seconds': seconds,
+            'us_per_frame': 1e6*seconds/max(n_frames,1),
+            'peak_bytes': int(peak),
+        }
+        print('{:<36s} {:>8d} frames {:>12.3f} ms {:>10.3f} us/frame {:>10.1f} KiB'.format(
+            name,results[name]['n_frames'],1e3*seconds,
+            results[name]['us_per_frame'],peak/1024.))
+    return results
+
+def compare(results,baseline,threshold):
+    """
+    Print the change of every kernel against the baseline.
+
+    Returns
+    -------
+    list of the names of kernels slower than the baseline by more
+    than threshold
+    """
+    regressions = []
+    for name,result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result['seconds']/baseline[name]['seconds']
+        flag = ''
+        if ratio > 1. + threshold:
+            flag = 'REGRESSION'
+            regressions.append(name)
+        print('{:<36s} {:>8.2f}x {}'.format(name,ratio,flag))
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save',metavar='JSON',
+        help='store the results as a baseline in this file')
+    parser.add_argument('--compare',metavar='JSON',
+        help='compare the results against the baseline in this file')
+    parser.add_argument('--threshold',type=float,default=0.25,
+        help='fractional slowdown that counts as a regression')
+    parser.add_argument('--repeat',type=int,default=5,
+        help='number of timed runs per kernel, the best is kept')
+    parser.add_argument('-k',dest='pattern',
+        help='only run kernels whose name contains this string')
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(repeat=args.repeat,pattern=args.pattern)
+
+    if args.save:
+        with open(args.save,'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'machine': platform.machine(),
+                'results': results,
+            },f,indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        print()
+        if compare(results,baseline,args.threshold):
+            return 1
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,11 +1,61 @@
 import numpy as np
 
+def rotation_matrices(alpha,beta,gamma):
+    """
+    Rotation matrices from the binary plane to the viewer's frame.
+
+    Parameters
+    ----------
+    alpha,beta,gamma: floats or arrays
+        orientation angles in degrees, broadcast against each other
+
+    Returns
+    -------
+    A: array of shape (..., 3, 3)
+        the product B.C.D for every set of angles
+    """
+    alpha,beta,gamma = np.broadcast_arrays(
+        np.radians(alpha),np.radians(beta),np.radians(gamma)
+    )
+    shape = alpha.shape + (3,3)
+    D = np.zeros(shape)
+    C = np.zeros(shape)
+    B = np.zeros(shape)
+
+    D[...,0,0] = D[...,1,1] = np.cos(alpha)
+    D[...,1,0] = -np.sin(alpha)
+    D[...,0,1] = np.sin(alpha)
+    D[...,2,2] = 1.
+
+    C[...,1,1] = C[...,2,2] = np.cos(beta)
+    C[...,2,1] = -np.sin(beta)
+    C[...,1,2] = np.sin(beta)
+    C[...,0,0] = 1.
+
+    B[...,0,0] = B[...,1,1] = np.cos(gamma)
+    B[...,1,0] = -np.sin(gamma)
+    B[...,0,1] = np.sin(gamma)
+    B[...,2,2] = 1.
+
+    return np.matmul(np.matmul(B,C),D)
+
 class Binary:
-    
+
+    __slots__ = (
+        'm1','m2','_alpha','_beta','_gamma','_A',
+        '_omega','frame_rate','precession','precession_rate','_phase1',
+        '_D','_C','_B','_r',
+        '_trajectory','_n_frames',
+    )
+
+    # initial number of frames the trajectory buffer can hold
+    _initial_capacity = 256
+
     def __init__(self,
         m1=10.,m2=10.,
         alpha=50.,beta=30.,gamma=0.,
-        frame_rate = 30.,omega = 1.
+        frame_rate = 30.,omega = 1.,
+        precession_rate = None,
     ):
         """
         A class for representing binaries.
@@ -26,22 +76,29 @@ class Binary:
             frames per second
         omega: float
             rotations per second
+        precession_rate: tuple of 3 floats, optional
+            rates of change of alpha, beta and gamma in degrees
+            per second; the orientation is fixed if None
         """
         self.m1 = m1
         self.m2 = m2
+        self._A = None
         self.alpha = alpha
         self.beta = beta
         self.gamma = gamma
         self._omega = omega
         self.frame_rate = frame_rate
-        self.precession='off'
+        self.precession = 'off' if precession_rate is None else 'on'
+        self.precession_rate = precession_rate
         self._phase1 = self.gamma_rad
         self._D = np.identity(3)
         self._C = np.identity(3)
         self._B = np.identity(3)
 
-        self._pos1_projected = []
-        self._pos2_projected = []
+        # projected positions of both bodies, one (2,3) block per frame,
+        # grown geometrically as frames are added
+        self._trajectory = np.empty((self._initial_capacity,2,3))
+        self._n_frames = 0
         self._r = 1.
         
 
@@ -53,6 +110,33 @@ class Binary:
     def omega(self):
         return self._omega
 
+    @property
+    def alpha(self):
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self,alpha):
+        self._alpha = alpha
+        self._A = None
+
+    @property
+    def beta(self):
+        return self._beta
+
+    @beta.setter
+    def beta(self,beta):
+        self._beta = beta
+        self._A = None
+
+    @property
+    def gamma(self):
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self,gamma):
+        self._gamma = gamma
+        self._A = None
+
     @property
     def alpha_rad(self):
         return self.alpha*np.pi/180.
@@ -79,6 +163,40 @@ class Binary:
         
     def orbit(self):
         self._phase1 = self.phase1 + 2.*np.pi*self.omega/self.frame_rate
+        if self.precession == 'on':
+            dalpha,dbeta,dgamma = self.precession_rate
+            self.alpha += dalpha/self.frame_rate
+            self.beta += dbeta/self.frame_rate
+            self.gamma += dgamma/self.frame_rate
+
+    def precession_angles(self,n_steps):
+        """
+        alpha, beta and gamma after each of the next n_steps
+        calls to orbit(), as three arrays
+        """
+        steps = np.arange(1,n_steps+1)/self.frame_rate
+        dalpha,dbeta,dgamma = self.precession_rate
+        return (self.alpha + dalpha*steps,
+                self.beta + dbeta*steps,
+                self.gamma + dgamma*steps)
+
+    def rotation_stack(self,n_steps):
+        """
+        Projection matrices for each of the next n_steps frames,
+        shape (n_steps,3,3). The same matrix repeats unless
+        precession is on.
+        """
+        if self.precession == 'on':
+            return rotation_matrices(*self.precession_angles(n_steps))
+        return np.broadcast_to(self.Amatrix,(n_steps,3,3))
+
+    def _advance_orientation(self,n_steps):
+        if self.precession == 'on':
+            dalpha,dbeta,dgamma = self.precession_rate
+            dt = n_steps/self.frame_rate
+            self.alpha += dalpha*dt
+            self.beta += dbeta*dt
+            self.gamma += dgamma*dt
 
     @property
     def Dmatrix(self):
@@ -103,7 +221,50 @@ class Binary:
     
     @property
     def Amatrix(self):
-       return np.matmul(np.matmul(self.Bmatrix,self.Cmatrix),self.Dmatrix)
+        """
+        rotation from the binary plane to the viewer's frame,
+        cached until one of alpha, beta or gamma is set
+        """
+        if self._A is None:
+            self._A = np.matmul(np.matmul(self.Bmatrix,self.Cmatrix),self.Dmatrix)
+        return self._A
+
+    def view_matrices(self,alpha,beta,gamma):
+        """
+        Stack of projection matrices for many viewer orientations.
+
+        Parameters
+        ----------
+        alpha,beta,gamma: floats or arrays of length n_views
+            orientation angles in degrees
+
+        Returns
+        -------
+        array of shape (n_views,3,3)
+        """
+        return np.reshape(rotation_matrices(alpha,beta,gamma),(-1,3,3))
+
+    def project_views(self,alpha,beta,gamma):
+        """
+        Re-project the evolved trajectory for many viewer orientations
+        at once, without re-evolving the orbit.
+
+        Parameters
+        ----------
+        alpha,beta,gamma: floats or arrays of length n_views
+            orientation angles in degrees
+
+        Returns
+        -------
+        pos1_proj,pos2_proj: arrays of shape (n_views,n_frames,3)
+        """
+        if self.precession == 'on':
+            raise ValueError('project_views needs a fixed orientation, but precession is on')
+        # Amatrix is a rotation, so its transpose takes the stored
+        # projections back into the binary plane
+        views = np.matmul(self.view_matrices(alpha,beta,gamma),self.Amatrix.T)
+        return (np.matmul(self.pos1_projected,np.swapaxes(views,1,2)),
+                np.matmul(self.pos2_projected,np.swapaxes(views,1,2)))
 
     @property
     def pos1(self):
@@ -123,23 +284,243 @@ class Binary:
     def project(self):
         return np.matmul(self.Amatrix,self.pos1),np.matmul(self.Amatrix,self.pos2)
 
-    def evolve(self,n_steps=1):
-        for i in range(n_steps):
-            self.orbit()
-            pos1_proj,pos2_proj = self.project()
-            self._pos1_projected.append(pos1_proj) 
-            self._pos2_projected.append(pos2_proj)
+    def orbital_phases(self,n_steps):
+        """
+        phase of the primary after each of the next n_steps
+        calls to orbit(), as one array
+        """
+        steps = np.arange(1,n_steps+1)
+        return self.phase1 + steps*(2.*np.pi*self.omega/self.frame_rate)
+
+    def period_frames(self,max_frames,tol=1e-9):
+        """
+        Smallest number of frames after which the projected orbit
+        repeats exactly, so that an animation of that many frames
+        loops seamlessly.
+
+        At constant omega the orbit advances omega/frame_rate orbits
+        per frame, so it repeats after n frames when n*omega/frame_rate
+        is a whole number. A precessing orbit never repeats.
+
+        Parameters
+        ----------
+        max_frames: int
+            longest period to look for
+        tol: float
+            relative tolerance on a whole number of orbits
+
+        Returns
+        -------
+        int, or None if the orbit does not repeat within max_frames
+        """
+        if self.precession == 'on':
+            return None
+        orbits = np.arange(1,max_frames+1)*(self.omega/self.frame_rate)
+        whole = np.abs(orbits - np.rint(orbits)) <= tol*np.maximum(orbits,1.)
+        # a period must contain at least one full orbit
+        whole &= np.rint(orbits) >= 1.
+        repeats = np.flatnonzero(whole)
+        return int(repeats[0]) + 1 if len(repeats) else None
+
+    def project_phases(self,phases,r=None,out1=None,out2=None,A=None):
+        """
+        Projected positions of both bodies for a whole array of phases.
+
+        Parameters
+        ----------
+        phases: array
+            phases of the primary, in radians
+        r: float or array, optional
+            separation at each phase, defaults to self.r
+        A: array of shape (3,3) or (n_frames,3,3), optional
+            projection matrix, or one per frame, defaults to Amatrix
+        out1,out2: arrays of shape (n_frames,3), optional
+            preallocated arrays to write the projections into
+
+        Returns
+        -------
+        pos1_proj,pos2_proj: arrays of shape (n_frames,3)
+        """
+        if r is None:
+            r = self.r
+        n_frames = len(phases)
+        if out1 is None:
+            out1 = np.empty((n_frames,3))
+        if out2 is None:
+            out2 = np.empty((n_frames,3))
+
+        # the orbit lies in the XY plane of the binary, so only the
+        # first two columns of Amatrix contribute to the projection
+        xy = np.empty((n_frames,2))
+        np.cos(phases,out=xy[:,0])
+        np.sin(phases,out=xy[:,1])
+        xy *= np.reshape(r,(-1,1))
+        if A is None:
+            A = self.Amatrix
+        M = self.m1 + self.m2
+        if np.ndim(A) == 3:
+            np.einsum('nij,nj->ni',A[:,:,:2],xy,out=out1)
+        else:
+            np.matmul(xy,A[:,:2].T,out=out1)
+        # the secondary sits at phase1 + pi
+        out2[:] = out1
+        out1 *= self.m2/M
+        out2 *= -self.m1/M
+        return out1,out2
+
+    def evolve(self,n_steps=1,batched=True):
+        """
+        Evolve the binary by n_steps frames, storing the projected
+        position of both bodies at every frame.
+
+        Parameters
+        ----------
+        n_steps: int
+            number of frames to evolve by
+        batched: bool
+            compute all frames at once with array operations,
+            otherwise step through the orbit one frame at a time
+        """
+        if not batched:
+            for i in range(n_steps):
+                self.orbit()
+                pos1_proj,pos2_proj = self.project()
+                self.store_frame(pos1_proj,pos2_proj)
+            return
+        if n_steps < 1:
+            return
+
+        phases = self.orbital_phases(n_steps)
+        out1,out2 = self.next_frames(n_steps)
+        A = self.rotation_stack(n_steps) if self.precession == 'on' else None
+        self.project_phases(phases,out1=out1,out2=out2,A=A)
+        self._phase1 = phases[-1]
+        self._advance_orientation(n_steps)
+
+    def iter_frames(self,chunk_size=64,n_frames=None):
+        """
+        Evolve the binary lazily, yielding the projected positions of
+        both bodies a block at a time without storing them, so that
+        long or open-ended animations run in constant memory.
+
+        Parameters
+        ----------
+        chunk_size: int
+            number of frames per block
+        n_frames: int, optional
+            total number of frames to yield; runs forever if None
+
+        Yields
+        ------
+        pos1_proj,pos2_proj: arrays of shape (<=chunk_size,3)
+        """
+        remaining = n_frames
+        while remaining is None or remaining > 0:
+            n_steps = chunk_size if remaining is None else min(chunk_size,remaining)
+            phases = self.orbital_phases(n_steps)
+            A = self.rotation_stack(n_steps) if self.precession == 'on' else None
+            pos1_proj,pos2_proj = self.project_phases(phases,A=A)
+            self._phase1 = phases[-1]
+            self._advance_orientation(n_steps)
+            if remaining is not None:
+                remaining -= n_steps
+            yield pos1_proj,pos2_proj
+
+    def reserve(self,n_frames):
+        """
+        Make room for n_frames more frames in the trajectory buffer,
+        at least doubling its capacity when it has to grow.
+        """
+        needed = self._n_frames + n_frames
+        capacity = len(self._trajectory)
+        if needed > capacity:
+            grown = np.empty((max(needed,2*capacity),2,3))
+            grown[:self._n_frames] = self._trajectory[:self._n_frames]
+            self._trajectory = grown
+
+    def next_frames(self,n_frames):
+        """
+        Claim the next n_frames slots of the trajectory buffer.
+
+        Returns
+        -------
+        out1,out2: writable views of shape (n_frames,3) to be filled
+            with the projected positions of the primary and secondary
+        """
+        self.reserve(n_frames)
+        block = self._trajectory[self._n_frames:self._n_frames+n_frames]
+        self._n_frames += n_frames
+        return block[:,0],block[:,1]
+
+    def store_frame(self,pos1_proj,pos2_proj):
+        out1,out2 = self.next_frames(1)
+        out1[0] = pos1_proj
+        out2[0] = pos2_proj
+
+    def load_frames(self,trajectory,phase1):
+        """
+        Append precomputed frames, e.g. from a TrajectoryCache, and
+        move the orbit on to the phase and, when precessing, the
+        orientation they end at. When nothing has
+        been stored yet the array is adopted as the buffer without
+        copying; it is copied as soon as more frames are added.
+
+        Parameters
+        ----------
+        trajectory: array of shape (n_frames,2,3)
+            projected positions of both bodies
+        phase1: float
+            phase of the primary after the last frame
+        """
+        if self._n_frames == 0:
+            self._trajectory = trajectory
+            self._n_frames = len(trajectory)
+        else:
+            out1,out2 = self.next_frames(len(trajectory))
+            out1[:] = trajectory[:,0]
+            out2[:] = trajectory[:,1]
+        self._phase1 = phase1
+        self._advance_orientation(len(trajectory))
+
+    @property
+    def params(self):
+        """
+        parameters that, together with the stored frames, fully
+        determine the orbit from here on
+        """
+        return dict(
+            m1=float(self.m1),m2=float(self.m2),
+            alpha=float(self.alpha),beta=float(self.beta),gamma=float(self.gamma),
+            omega=float(self._omega),frame_rate=float(self.frame_rate),
+            phase1=float(self.phase1),n_frames=self.n_frames,
+            precession_rate=self.precession_rate,
+        )
+
+    @property
+    def n_frames(self):
+        return self._n_frames
+
+    @property
+    def trajectory(self):
+        """
+        read-only view of the stored frames, shape (n_frames,2,3)
+        """
+        view = self._trajectory[:self._n_frames]
+        view.flags.writeable = False
+        return view
 
     @property
     def pos1_projected(self):
-        return np.array(self._pos1_projected)
+        return self.trajectory[:,0]
 
     @property
     def pos2_projected(self):
-        return np.array(self._pos2_projected) 
+        return self.trajectory[:,1]
 
 class InspiralingBinary(Binary):
 
+    __slots__ = ('Mc','G','c','tc','rmax','omegamax','t')
+
     def __init__(self,
         m1=10.,m2=10.,
         alpha=50.,beta=30.,gamma=0.,
@@ -160,7 +541,6 @@ class InspiralingBinary(Binary):
                     * (5./((8.*np.pi)**(8./3)))
                     * (((self.c**3.)/(self.G*self.Mc))**(5./3))
         )
-        print('tc',self.tc)        
 
         self.rmax = 2.*(self.G/(self.c**2))*(self.m1+self.m2)
         self.omegamax = np.sqrt(self.G*(self.m1+self.m2)/self.rmax**3)
@@ -168,33 +548,388 @@ class InspiralingBinary(Binary):
  
         self.t = [0.]
         pos1_proj,pos2_proj = self.project()
-        self._pos1_projected = [pos1_proj]
-        self._pos2_projected = [pos2_proj]         
+        self.store_frame(pos1_proj,pos2_proj)
 
     @property
     def nframes(self):
         return len(self.t)
 
+    @property
+    def params(self):
+        params = super().params
+        params['t'] = float(self.t[-1])
+        return params
+
+    @property
+    def chirp_constant(self):
+        """
+        K in omega(t) = (1/2) * (K*(tc - t))**(-3/8)
+        """
+        return ((((8.*np.pi)**(8./3))/5.)
+                * (self.G*self.Mc/(self.c**3.))**(5./3)
+        )
+
+    def omega_at(self,t):
+        """
+        orbital frequency at time(s) t, for t < tc
+        """
+        return (0.5)*(self.chirp_constant*(self.tc - t))**(-3./8)
+
+    def r_at(self,t):
+        """
+        orbital separation at time(s) t, for t < tc
+        """
+        return (self.G*(self.m1+self.m2)/(self.omega_at(t)**2))**(1./3)
+
+    @property
+    def t_merge(self):
+        """
+        time at which the separation shrinks to rmax
+        """
+        return self.t_at(self.rmax)
+
+    @property
+    def phase_rate(self):
+        """
+        2*pi*(4/5)*K**(-3/8), the orbital phase gained as (tc - t)**(5/8)
+        decreases by one
+        """
+        return 2.*np.pi*(4./5)*self.chirp_constant**(-3./8)
+
+    def accumulated_phase(self,t0,t):
+        """
+        orbital phase accumulated between t0 and time(s) t, both
+        before tc:
+        phase_rate*((tc - t0)**(5/8) - (tc - t)**(5/8))
+        """
+        return self.phase_rate*((self.tc - t0)**(5./8) - (self.tc - np.asarray(t))**(5./8))
+
+    def phase_grid(self,t0,max_dphase):
+        """
+        Times from t0 to the merger at which the orbital phase advances
+        by exactly max_dphase radians per step, except for the last
+        step, which is shorter and ends at t_merge.
+
+        By accumulated_phase, the grid is uniform in (tc - t)**(5/8).
+        """
+        rate = self.phase_rate
+        u0 = (self.tc - t0)**(5./8)
+        u_merge = (self.tc - self.t_merge)**(5./8)
+        n_grid = int(np.ceil((u0 - u_merge)*rate/max_dphase)) + 1
+        u = u0 - (max_dphase/rate)*np.arange(max(n_grid,1))
+        u = np.append(u[u > u_merge],u_merge)
+        return self.tc - u**(8./5)
+
     @property
     def omega(self):
-        return (0.5)*((((8.*np.pi)**(8./3))/5.)
-                        * (self.G*self.Mc/(self.c**3.))**(5./3)
-                        * (self.tc - self.t[-1])
-                  )**(-3./8)
+        return self.omega_at(self.t[-1])
 
     @property
     def r(self):
-        return (self.G*(self.m1+self.m2)/(self.omega**2))**(1./3)
-
-    def inspiral(self):
-        while self.r > self.rmax:
-            print('r,rmax:',self.r,self.rmax)
-            self.t.append(self.t[-1]+(1./self.frame_rate))
-            self.orbit()
-            if isinstance(self.r,complex):
-                print('r going complex, breaking out of loop')
-                break
-            pos1_proj,pos2_proj = self.project()
-            self._pos1_projected.append(pos1_proj)
-            self._pos2_projected.append(pos2_proj)     
+        return self.r_at(self.t[-1])
+
+    def period_frames(self,max_frames,tol=1e-9):
+        """
+        an inspiral never repeats
+        """
+        return None
+
+    def inspiral(self,batched=True,max_dphase=None):
+        """
+        Evolve the binary until its separation shrinks to rmax.
+
+        Parameters
+        ----------
+        batched: bool
+            evaluate omega(t) and r(t) on the whole time grid at once
+            and integrate the phase with a cumulative sum, otherwise
+            step through the inspiral one frame at a time
+        max_dphase: float, optional
+            if given, step adaptively so that the phase advances by
+            this many radians per frame instead of stepping at a fixed
+            frame_rate; the slow early inspiral then takes far fewer
+            frames. Must be below pi. Only used when batched.
+        """
+        if not batched:
+            self.t = list(self.t)
+            while self.r > self.rmax:
+                self.t.append(self.t[-1]+(1./self.frame_rate))
+                self.orbit()
+                if isinstance(self.r,complex):
+                    break
+                pos1_proj,pos2_proj = self.project()
+                self.store_frame(pos1_proj,pos2_proj)
+            return
+
+        t0 = self.t[-1]
+        if max_dphase is None:
+            dt = 1./self.frame_rate
+            # grid up to one step past the analytic merger time,
+            # staying strictly before coalescence
+            n_grid = int(np.ceil((self.t_merge - t0)*self.frame_rate)) + 2
+            n_grid = max(n_grid,1)
+            t = t0 + dt*np.arange(n_grid)
+            t = t[t < self.tc]
+        else:
+            if not 0. < max_dphase < np.pi:
+                raise ValueError('max_dphase must be between 0 and pi')
+            t = self.phase_grid(t0,max_dphase)
+        r = self.r_at(t)
+
+        # r decreases monotonically, so the first frame at or inside
+        # rmax is found by a binary search; that frame is kept
+        n_frames = min(np.searchsorted(-r,-self.rmax,side='left') + 1,len(t))
+        if n_frames < 2:
+            return
+        t = t[:n_frames]
+        r = r[:n_frames]
+
+        if max_dphase is None:
+            phases = np.cumsum(2.*np.pi*self.omega_at(t[1:])*dt)
+        else:
+            phases = self.accumulated_phase(t0,t[1:])
+        phases += self.phase1
+        out1,out2 = self.next_frames(n_frames-1)
+        self.project_phases(phases,r=r[1:],out1=out1,out2=out2)
+        self._phase1 = phases[-1]
+        self.t = np.concatenate((self.t,t[1:]))
+
+    def resample(self,fps,length,warp=0.75,max_dphase=0.5):
+        """
+        Replace the stored trajectory with exactly the frames an
+        animation of the given length needs at the given display fps,
+        ending at the last evolved frame.
+
+        The frames are evenly spaced in (tc - t)**warp, as in
+        final_orbits, so the last step is the one that advances the
+        phase most. When the evolved inspiral holds too many orbits for
+        that step to stay within max_dphase, the animation starts later
+        and shows only the last orbits, rather than jumping whole orbits
+        from one frame to the next.
+
+        The phase is unwrapped from the stored frames and interpolated,
+        so consecutive stored frames must be less than pi apart in
+        phase, which adaptive stepping guarantees; a ValueError is
+        raised otherwise.
+
+        Parameters
+        ----------
+        fps: float
+            display frames per second
+        length: float
+            length of the animation in seconds
+        warp: float
+            exponent of the frame spacing, between 5/8 and 1
+        max_dphase: float
+            largest phase step between displayed frames, below pi
+        """
+        if not 0. < max_dphase < np.pi:
+            raise ValueError('max_dphase must be between 0 and pi')
+        n_frames = int(length*fps)
+        t = np.asarray(self.t)
+        # steps of pi or more cannot be told apart from shorter steps
+        # backwards once reduced to positions
+        if np.any(np.diff(self.accumulated_phase(t[0],t)) >= np.pi):
+            raise ValueError('stored frames are pi or more apart in phase, '
+                'evolve with inspiral(max_dphase=...) below pi')
+        # rotate the stored primary positions back into the binary plane
+        xy = np.matmul(self.pos1_projected,self.Amatrix[:,:2])
+        phase = np.unwrap(np.arctan2(xy[:,1],xy[:,0]))
+
+        s_start = (self.tc - t[0])**warp
+        s_end = (self.tc - t[-1])**warp
+        if n_frames > 1:
+            # widest spacing at which the last step gains max_dphase
+            u_end = (self.tc - t[-1])**(5./8)
+            step = (u_end + max_dphase/self.phase_rate)**(8.*warp/5) - s_end
+            s_start = min(s_start,s_end + (n_frames-1)*step)
+        t_display = self.tc - np.linspace(s_start,s_end,n_frames)**(1./warp)
+        phases = np.interp(t_display,t,phase)
+        if np.any(np.diff(phases) >= np.pi):
+            raise ValueError('displayed frames are pi or more apart in phase, '
+                'lower max_dphase')
+
+        self._trajectory = np.empty((max(n_frames,1),2,3))
+        self._n_frames = 0
+        out1,out2 = self.next_frames(n_frames)
+        self.project_phases(phases,r=self.r_at(t_display),out1=out1,out2=out2)
+        self.t = t_display
+        if n_frames:
+            self._phase1 = phases[-1]
+
+    def t_at(self,r):
+        """
+        time(s) at which the separation is r, the inverse of r_at
+        """
+        omega = np.sqrt(self.G*(self.m1+self.m2)/np.asarray(r)**3)
+        return self.tc - (2.*omega)**(-8./3)/self.chirp_constant
+
+    def final_orbits(self,n_frames,r_start,warp=0.75):
+        """
+        Replace the stored trajectory with n_frames covering the end of
+        the inspiral, from separation r_start down to rmax, computed
+        analytically rather than by stepping through the whole
+        inspiral.
+
+        The frames are evenly spaced in (tc - t)**warp. warp=1 spaces
+        them evenly in time, which leaves the last orbits to a handful
+        of frames; warp=5/8 advances the phase by the same amount every
+        frame, as inspiral(max_dphase=...) does. In between, the orbit
+        visibly speeds up towards the merger while every orbit still
+        gets enough frames to be followed.
+
+        Parameters
+        ----------
+        n_frames: int
+            number of frames, the first at r_start and the last at rmax
+        r_start: float
+            separation at the first frame, larger than rmax
+        warp: float
+            exponent of the frame spacing, between 5/8 and 1
+        """
+        if not r_start > self.rmax:
+            raise ValueError('r_start must be larger than rmax')
+        t_start = self.t_at(r_start)
+        tau_start = self.tc - t_start
+        tau_merge = self.tc - self.t_merge
+        tau = np.linspace(tau_start**warp,tau_merge**warp,n_frames)**(1./warp)
+        t = self.tc - tau
+        phases = self.phase1 + self.accumulated_phase(t_start,t)
+
+        self._trajectory = np.empty((max(n_frames,1),2,3))
+        self._n_frames = 0
+        out1,out2 = self.next_frames(n_frames)
+        self.project_phases(phases,r=self.r_at(t),out1=out1,out2=out2)
+        self.t = t
+        if n_frames:
+            self._phase1 = phases[-1]
+
+class BinaryPopulation:
+
+    __slots__ = (
+        'm1','m2','_alpha','_beta','_gamma','omega',
+        'frame_rate','_phase1','_A',
+        '_pos1_projected','_pos2_projected',
+    )
+
+    def __init__(self,
+        m1=10.,m2=10.,
+        alpha=50.,beta=30.,gamma=0.,
+        frame_rate = 30.,omega = 1.
+    ):
+        """
+        Many binaries with fixed separation, stored as one array per
+        parameter and evolved together.
+
+        Parameters
+        ----------
+        m1,m2,alpha,beta,gamma,omega: floats or arrays
+            as for Binary, broadcast against each other to one value
+            per binary
+        frame_rate: float
+            frames per second, shared by the whole population
+        """
+        self._A = None
+        (self.m1,self.m2,
+         self.alpha,self.beta,self.gamma,
+         self.omega) = [
+            np.array(p,dtype=float) for p in np.broadcast_arrays(
+                np.atleast_1d(m1),np.atleast_1d(m2),
+                alpha,beta,gamma,omega
+            )
+        ]
+        self.frame_rate = frame_rate
+        self._phase1 = np.radians(self.gamma)
+
+        self._pos1_projected = np.empty((len(self),0,3))
+        self._pos2_projected = np.empty((len(self),0,3))
+
+    def __len__(self):
+        return len(self.m1)
+
+    def _per_binary(self,value):
+        # one float per binary, as the constructor stores them
+        return np.array(np.broadcast_to(value,np.shape(self.m1)),dtype=float)
+
+    @property
+    def alpha(self):
+        return self._alpha
+
+    @alpha.setter
+    def alpha(self,alpha):
+        self._alpha = self._per_binary(alpha)
+        self._A = None
+
+    @property
+    def beta(self):
+        return self._beta
+
+    @beta.setter
+    def beta(self,beta):
+        self._beta = self._per_binary(beta)
+        self._A = None
+
+    @property
+    def gamma(self):
+        return self._gamma
+
+    @gamma.setter
+    def gamma(self,gamma):
+        self._gamma = self._per_binary(gamma)
+        self._A = None
+
+    @property
+    def Amatrix(self):
+        """
+        stack of projection matrices, shape (n_binaries,3,3),
+        cached until one of alpha, beta or gamma is set
+        """
+        if self._A is None:
+            self._A = rotation_matrices(self.alpha,self.beta,self.gamma)
+        return self._A
 
+    @property
+    def phase1(self):
+        return self._phase1
+
+    @property
+    def n_frames(self):
+        return self._pos1_projected.shape[1]
+
+    def evolve(self,n_steps=1):
+        """
+        Evolve every binary by n_steps frames in one pass.
+        """
+        if n_steps < 1:
+            return
+        steps = np.arange(1,n_steps+1)
+        phases = (self.phase1[:,None]
+                  + steps*(2.*np.pi*self.omega/self.frame_rate)[:,None]
+        )
+
+        xy = np.empty(phases.shape + (2,))
+        np.cos(phases,out=xy[...,0])
+        np.sin(phases,out=xy[...,1])
+        # (n_binaries,n_steps,2) x (n_binaries,2,3)
+        proj = np.matmul(xy,np.swapaxes(self.Amatrix[:,:,:2],1,2))
+
+        M = self.m1 + self.m2
+        pos1_proj = proj*(self.m2/M)[:,None,None]
+        proj *= (-self.m1/M)[:,None,None]
+        if self.n_frames:
+            pos1_proj = np.concatenate((self._pos1_projected,pos1_proj),axis=1)
+            proj = np.concatenate((self._pos2_projected,proj),axis=1)
+        self._pos1_projected = pos1_proj
+        self._pos2_projected = proj
+        self._phase1 = phases[:,-1]
+
+    @property
+    def pos1_projected(self):
+        """
+        projected primary positions, shape (n_binaries,n_frames,3)
+        """
+        return self._pos1_projected
+
+    @property
+    def pos2_projected(self):
+        return self._pos2_projected
@@ -0,0 +1,136 @@
+import json
+import base64
+import numpy as np
+
+# fixed-point positions: 1/16 pixel resolution fits a 2048 px frame in int16
+POSITION_SCALE = 16
+
+_TEMPLATE = """
+<canvas id="orbit" width="{width}" height="{height}"></canvas>
+<script>
+const p = {payload};
+function decode(b64) {{
+    const s = atob(b64);
+    const bytes = new Uint8Array(s.length);
+    for (let i = 0; i < s.length; i++) bytes[i] = s.charCodeAt(i);
+    return bytes.buffer;
+}}
+const pos = new Int16Array(decode(p.positions));
+const front1 = new Uint8Array(decode(p.front1));
+const ctx = document.getElementById("orbit").getContext("2d");
+ctx.lineWidth = p.edge_width;
+ctx.fillStyle = p.facecolor;
+ctx.strokeStyle = p.edgecolor;
+
+function body(k, i) {{
+    ctx.beginPath();
+    ctx.arc(pos[4*i + 2*k]/p.scale, pos[4*i + 2*k + 1]/p.scale,
+            p.radius[k], 0, 2*Math.PI);
+    ctx.fill();
+    ctx.stroke();
+}}
+
+// the frame is derived from the elapsed time, so that vsync jitter
+// cannot hold a frame for an extra refresh
+let t0 = null, shown = -1;
+function draw(t) {{
+    if (t0 === null) t0 = t;
+    const frame = Math.floor((t - t0)*p.fps/1000) % p.n_frames;
+    if (frame !== shown) {{
+        shown = frame;
+        ctx.clearRect(0, 0, p.width, p.height);
+        ctx.save();
+        ctx.fillStyle = p.background;
+        ctx.fillRect(0, 0, p.width, p.height);
+        ctx.restore();
+        // the black hole that is closer is drawn last
+        if ((front1[frame >> 3] >> (7 - (frame & 7))) & 1) {{
+            body(1, frame); body(0, frame);
+        }} else {{
+            body(0, frame); body(1, frame);
+        }}
+    }}
+    requestAnimationFrame(draw);
+}}
+requestAnimationFrame(draw);
+</script>
+"""
+
+def orbit_payload(
+    binary,
+    BH_scale,
+    fps,
+    shape = (400,400),
+    xlim = (-1.,1.),
+    ylim = (-1.,1.),
+    edge_width = 100./72,
+    facecolor = 'black',
+    edgecolor = 'white',
+    background = 'white',
+):
+    """
+    Compact description of an evolved binary's animation, for drawing
+    in the browser instead of shipping rendered frames.
+
+    Positions are converted to canvas pixels and stored as
+    little-endian int16 in units of 1/POSITION_SCALE pixel, and the
+    depth order of each frame as one bit, both base64 encoded.
+
+    Parameters
+    ----------
+    binary: Binary
+        an evolved Binary
+    BH_scale: float
+        radius of a black hole per solar mass, in data units
+    fps: float
+        frames per second
+    shape,xlim,ylim: tuples
+        canvas size in pixels and the data limits at its edges, as
+        for rasterizer.rasterize_binary
+    edge_width: float
+        width of the edge ring in pixels
+    facecolor,edgecolor,background: str
+        CSS colors
+
+    Returns
+    -------
+    dict that can be serialized as JSON
+    """
+    height,width = shape
+    x_scale = (xlim[1] - xlim[0])/width
+    y_scale = (ylim[1] - ylim[0])/height
+
+    trajectory = binary.trajectory
+    pixels = np.empty((len(trajectory),2,2))
+    pixels[...,0] = (trajectory[...,1] - xlim[0])/x_scale
+    pixels[...,1] = (ylim[1] - trajectory[...,2])/y_scale
+    positions = np.rint(np.clip(pixels*POSITION_SCALE,-32768,32767)).astype('<i2')
+
+    # make sure star that is closer is shown on top of the other
+    front1 = np.packbits(trajectory[:,0,0] > trajectory[:,1,0])
+
+    return dict(
+        n_frames = len(trajectory),
+        fps = fps,
+        width = width,
+        height = height,
+        scale = POSITION_SCALE,
+        radius = [BH_scale*binary.m1/x_scale,BH_scale*binary.m2/x_scale],
+        edge_width = edge_width,
+        facecolor = facecolor,
+        edgecolor = edgecolor,
+        background = background,
+        positions = base64.b64encode(positions.tobytes()).decode('ascii'),
+        front1 = base64.b64encode(front1.tobytes()).decode('ascii'),
+    )
+
+def orbit_html(payload):
+    """
+    Self-contained HTML canvas that plays an orbit_payload in a loop,
+    e.g. for streamlit.components.v1.html.
+    """
+    return _TEMPLATE.format(
+        width = payload['width'],
+        height = payload['height'],
+        payload = json.dumps(payload),
+    )
@@ -0,0 +1,153 @@
+"""
+Benchmarks for the animation formats in animation_writer.py.
+
+Encodes the Chirp Game orbit animation and every animated GIF shipped
+in graphics/ as GIF, WebP and APNG, and reports the encode time and
+the size of each file, relative to the GIF.
+
+    python encode_benchmarks.py                       # run and print
+    python encode_benchmarks.py --save encode.json    # store the results
+    python encode_benchmarks.py -k bbh --repeat 1
+
+Encoder settings come from animation_writer.FORMAT_OPTIONS and can be
+overridden per format, e.g. --webp quality=60 --webp method=6.
+"""
+
+import os
+import sys
+import glob
+import json
+import argparse
+import platform
+import numpy as np
+from PIL import Image,ImageSequence
+
+import rasterizer
+import orbit_animation
+import animation_writer
+from benchmarks import measure
+
+ASSETS = 'graphics/*.gif'
+FORMATS = list(animation_writer.ENCODERS)
+
+def chirp_game_frames():
+    """
+    the Chirp Game animation at its full length of 240 frames, as
+    render_orbit rasterizes it
+    """
+    b = orbit_animation.chirp_game_binary(20.,21.,loop_period=False)
+    frames = rasterizer.rasterize_binary(
+        b.pos1_projected,b.pos2_projected,b.m1,b.m2,1./100,
+        **rasterizer.figure_extent()
+    )
+    return frames,30.
+
+def gif_frames(path):
+    """
+    decoded RGB frames of a GIF file and its frame rate
+    """
+    with Image.open(path) as image:
+        duration = image.info.get('duration') or 100
+        frames = np.stack([
+            np.asarray(frame.convert('RGB'))
+            for frame in ImageSequence.Iterator(image)
+        ])
+    return frames,1000./duration
+
+def animations(pattern=None):
+    """
+    yields (name, frames, fps, original_bytes) for every animation,
+    original_bytes being None for generated ones
+    """
+    sources = [('chirp_game',chirp_game_frames,None)]
+    for path in sorted(glob.glob(ASSETS)):
+        sources.append((os.path.basename(path),
+                        lambda path=path: gif_frames(path),
+                        os.path.getsize(path)))
+    for name,load,original_bytes in sources:
+        if pattern is not None and pattern not in name:
+            continue
+        frames,fps = load()
+        yield name,frames,fps,original_bytes
+
+def run_benchmarks(repeat=3,pattern=None,options=None):
+    options = options or {}
+    results = {}
+    for name,frames,fps,original_bytes in animations(pattern):
+        results[name] = {
+            'n_frames': len(frames),
+            'shape': list(frames.shape[1:]),
+            'original_bytes': original_bytes,
+        }
+        if original_bytes is not None:
+            print('{:<24s} {:>5d} frames, {:.1f} KiB as shipped'.format(
+                name,len(frames),original_bytes/1024.))
+        else:
+            print('{:<24s} {:>5d} frames'.format(name,len(frames)))
+        for format in FORMATS:
+            format_options = options.get(format,{})
+            data = animation_writer.encode_animation(
+                frames,fps,format,**format_options)
+            seconds,peak = measure(
+                lambda: None,
+                lambda state: animation_writer.encode_animation(
+                    frames,fps,format,**format_options),
+                repeat=repeat)
+            results[name][format] = {
+                'seconds': seconds,
+                'bytes': len(data),
+                'peak_bytes': int(peak),
+                'options': dict(animation_writer.FORMAT_OPTIONS[format],**format_options),
+            }
+        gif_bytes = results[name]['gif']['bytes']
+        for format in FORMATS:
+            result = results[name][format]
+            print('    {:<6s} {:>10.1f} ms {:>10.1f} KiB {:>7.2f}x GIF size'.format(
+                format,1e3*result['seconds'],result['bytes']/1024.,
+                result['bytes']/gif_bytes))
+    return results
+
+def parse_options(pairs):
+    """
+    'key=value' strings to a dict, with values read as JSON where
+    possible, so that numbers and booleans keep their types
+    """
+    options = {}
+    for pair in pairs or []:
+        key,_,value = pair.partition('=')
+        try:
+            options[key] = json.loads(value)
+        except ValueError:
+            options[key] = value
+    return options
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--save',metavar='JSON',
+        help='store the results in this file')
+    parser.add_argument('--repeat',type=int,default=3,
+        help='number of timed runs per encoding, the best is kept')
+    parser.add_argument('-k',dest='pattern',
+        help='only run animations whose name contains this string')
+    for format in FORMATS:
+        parser.add_argument('--' + format,action='append',metavar='KEY=VALUE',
+            help='{} encoder setting, may be repeated'.format(format))
+    args = parser.parse_args(argv)
+
+    options = {format: parse_options(getattr(args,format)) for format in FORMATS}
+    results = run_benchmarks(repeat=args.repeat,pattern=args.pattern,options=options)
+
+    if args.save:
+        with open(args.save,'w') as f:
+            json.dump({
+                'python': platform.python_version(),
+                'numpy': np.__version__,
+                'pillow': Image.__version__,
+                'machine': platform.machine(),
+                'results': results,
+            },f,indent=2)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,4 +1,5 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import numpy as np
 from astropy.table import Table
 
@@ -7,23 +8,22 @@ import streamlit_analytics
 import matplotlib
 matplotlib.use('Agg')
 matplotlib.rcParams['text.usetex'] = False
-import matplotlib.pyplot as plt
 from matplotlib.collections import LineCollection
-from matplotlib import animation
 from matplotlib.patches import Circle
-
-from matplotlib.backends.backend_agg import RendererAgg
-lock = RendererAgg.lock
+from matplotlib.figure import Figure
 
 import altair as alt
 import pandas as pd
 from bokeh.layouts import column, row
 from bokeh.models import ColumnDataSource, Slider, TextInput
 from bokeh.plotting import figure
-from pycbc.waveform import get_td_waveform, get_fd_waveform
+from pycbc.waveform import get_fd_waveform
 from pycbc.filter import matchedfilter
-import binary
-import artists 
+import orbit_animation
+import orbit_atlas
+import render_service
+import waveform_cache
+import template_bank
 import wave
 from scipy.io import wavfile
 from scipy import signal
@@ -487,17 +487,26 @@ if chirp_option == "Chirp Game":
 
         m1 = st.slider("Mass 1", min_value=5, max_value=50, value=20)
         m2 = st.slider('Mass 2', min_value=5, max_value=50, value=20)
+        animation_mode = st.sidebar.radio("Orbit animation", ["GIF", "In browser", "Full merger"])
+
+        # slider positions are read from the bank prebuilt by template_bank.py;
+        # other generated waveforms are kept for every session, so events
+        # seen before are not generated again
+        @st.cache_resource
+        def load_waveform_cache():
+            return waveform_cache.WaveformCache(bank=template_bank.TemplateBank())
+
+        waveforms = load_waveform_cache()
 
-        hp1, hc1 = get_td_waveform(approximant="IMRPhenomD",
+        hp1, hc1 = waveforms.get_td_waveform(approximant="IMRPhenomD",
                  mass1=m1,
                  mass2=m2,
                  coa_phase=np.pi,
                  delta_t=1.0/2048,
                  f_lower=20.)
 
-        #@st.cache(hash_funcs={lal.LIGOTimeGPS: (-3, -800000000)})
         def load_event(mass1_event, mass2_event):
-            hp, hc = get_td_waveform(approximant="IMRPhenomD",
+            hp, hc = waveforms.get_td_waveform(approximant="IMRPhenomD",
                      mass1=mass1_event,
                      mass2=mass2_event,
                      coa_phase=np.pi,
@@ -551,6 +560,18 @@ if chirp_option == "Chirp Game":
         source = ColumnDataSource(data=dict(x=time, y=hp))
         source1 = ColumnDataSource(data=dict(x1=time1, y1=hp1))
 
+        @st.cache_resource
+        def load_orbit_atlas():
+            return orbit_atlas.OrbitAtlas()
+
+        @st.cache_resource
+        def load_render_service():
+            return render_service.RenderService()
+
+        # the animation rendered for the previous slider values, if any
+        previous_orbit_job = st.session_state.pop('orbit_job', None)
+        orbit_job = None
+
         col_anim, col_plot = st.columns([1,2])
         with col_plot:
                 # Set up plot
@@ -571,69 +592,42 @@ if chirp_option == "Chirp Game":
 
         with col_anim:
                 # ANIMATION
-                with lock:    
-    
-                        fig,ax = plt.subplots(figsize=(4,4))
-                        ax.set_axis_off()
-        
-                        fps = 30.
-                        length = 8.
-        
-                        omega = 40./(m1 + m2)
-        
-                        # create a Binary instance for the event
-                        binary = binary.Binary(
-                            m1 = m1,
-                            m2 = m2,
-                            alpha = 50.,
-                            beta = 20.,
-                            gamma = 95.,
-                            omega = omega,
-                            frame_rate = fps
-                            )
-        
-                        # evolve the binary over one orbit
-                        n_frames = int(length*fps)
-        
-                        binary.evolve(n_frames)
-        
-                        # make BBH artist
-                        bbh = artists.BinaryBlackHole(
-                            binary = binary,
-                            ax = ax,
-                            name='orbit',
-                            BH_scale = 1./100
-                        )
-        
-                        artist_dict = {}
-                        def init():
-                            artist_dict.update(bbh.setup_artists())
-                            #df = pd.DataFrame.from_dict(artist_dict)
-                        # configure plot axes, title
-                            ax.set_xlim([-1,1])
-                            ax.set_ylim([-1,1])
-                            #if args.name is not None:
-                            #    print('putting names on events')
-                            #    ax.set_title(args.name)
-                            return artist_dict
-        
-                        def animate(i):
-                            artist_dict.update(bbh.get_artists(i))
-                            #df = pd.DataFrame.from_dict(artist_dict)
-                            return artist_dict
-                        #print(init())                
-                        #bbh_animation = alt.Chart(df).mark_line().encode(
-                        #x=alt.X('1:T',axis=None),
-                        #y=alt.Y('0:Q',axis=None))
-        
-                        #print(f'saving to {args.outfile}')
-                        outfile = f"temp/chirpgame_anim.gif"
-                        anim = animation.FuncAnimation(fig,animate,init_func=init,frames=n_frames)
-                        anim.save(outfile,fps=fps,writer='imagemagick')
-                        #anim.save(outfile,fps=fps)
-        
-                        
-                        st.image(outfile)
+                if animation_mode == "Full merger":
+                    # the last orbits of the inspiral, the merger and the ringdown,
+                    # rendered in a worker process while the rest of the page is drawn
+                    orbit_placeholder = st.empty()
+                    orbit_placeholder.info("Rendering the merger animation...")
+                    orbit_job = load_render_service().resubmit(
+                        previous_orbit_job, m1, m2, renderer = 'merger',
+                        alpha = 50., beta = 20., gamma = 95.,
+                        fps = 30., length = 8.
+                    )
+                    st.session_state['orbit_job'] = orbit_job
+                elif animation_mode == "In browser":
+                    # send the trajectory, a few KB, and let the browser draw it
+                    html, height = orbit_animation.render_orbit_html(
+                        m1, m2,
+                        alpha = 50., beta = 20., gamma = 95.,
+                        fps = 30., length = 8.,
+                        BH_scale = 1./100
+                    )
+                    components.html(html, height=height)
+                else:
+                    orbit_kwargs = dict(
+                        alpha = 50., beta = 20., gamma = 95.,
+                        fps = 30., length = 8.,
+                        BH_scale = 1./100
+                    )
+                    # prebuilt by orbit_atlas.py; anything else is rendered in a worker
+                    # process while the rest of the page is drawn
+                    gif = load_orbit_atlas().get(m1, m2, **orbit_kwargs)
+                    if gif is not None:
+                        st.image(gif)
+                    else:
+                        orbit_placeholder = st.empty()
+                        orbit_placeholder.info("Rendering the orbit animation...")
+                        orbit_job = load_render_service().resubmit(previous_orbit_job, m1, m2, **orbit_kwargs)
+                        st.session_state['orbit_job'] = orbit_job
         
         
 
@@ -702,6 +696,16 @@ if chirp_option == "Chirp Game":
         You may find more information about the {event["name"][0]} event [here]({event_url}).
         """
 
+        # superseded animations are not needed any more
+        if previous_orbit_job is not None and previous_orbit_job is not orbit_job:
+            previous_orbit_job.cancel()
+        if orbit_job is not None:
+            try:
+                orbit_placeholder.image(orbit_job.result())
+            except Exception:
+                # e.g. a worker died; the next rerun submits the job again
+                orbit_placeholder.error("The animation could not be rendered.")
+
 
 #        """
         ###### Now, explore and find the black hole masses for other events in the list, or proceed to a short trivia on how the gravitational-wave chirp changes with the mass of black holes:
@@ -783,7 +787,8 @@ if chirp_option == "Detecting Gravitational Waves":
             r0 = r
             theta0 = np.zeros(100)
  
-            fig, ax = plt.subplots(subplot_kw={'projection': 'polar'})
+            fig = Figure()
+            ax = fig.add_subplot(projection='polar')
             
             ax.patch.set_facecolor('red')
             ax.patch.set_alpha(abs(1-np.sin(phi2/2)))
@@ -797,7 +802,7 @@ if chirp_option == "Detecting Gravitational Waves":
             ax.grid(True)
 
             ax.set_title("Phase", va='bottom', fontsize=20)
-            plt.tight_layout()
+            fig.tight_layout()
             fig
 
         W2 = A * np.sin(omega*time + phi2)
@@ -0,0 +1,309 @@
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+import binary
+import artists
+import rasterizer
+import animation_writer
+import client_animation
+
+def chirp_game_binary(
+    m1,m2,
+    alpha = 50.,beta = 20.,gamma = 95.,
+    fps = 30.,length = 8.,
+    loop_period = True,
+):
+    """
+    The Binary shown in the Chirp Game, evolved over the whole
+    animation.
+
+    The orbit runs at constant omega, so it repeats itself; unless
+    loop_period is False, only the frames of one period are evolved
+    when it fits within the animation. Played in a loop, as all the
+    renderers below do, these show the same motion as length*fps
+    frames, and without the jump where the longer animation wraps
+    around mid-orbit.
+
+    Parameters
+    ----------
+    m1,m2: floats
+        black hole masses in solar masses
+    alpha,beta,gamma: floats
+        viewing angles in degrees
+    fps: float
+        frames per second
+    length: float
+        length of the animation in seconds
+    loop_period: bool
+        evolve a single period of the orbit if it is shorter
+
+    Returns
+    -------
+    Binary
+    """
+    # heavier binaries orbit more slowly
+    omega = 40./(m1 + m2)
+
+    b = binary.Binary(
+        m1 = m1,
+        m2 = m2,
+        alpha = alpha,
+        beta = beta,
+        gamma = gamma,
+        omega = omega,
+        frame_rate = fps
+        )
+    n_frames = int(length*fps)
+    if loop_period:
+        n_frames = b.period_frames(n_frames) or n_frames
+    b.evolve(n_frames)
+    return b
+
+def render_orbit(
+    m1,m2,
+    alpha = 50.,beta = 20.,gamma = 95.,
+    fps = 30.,length = 8.,
+    BH_scale = 1./100,
+    figsize = (4.,4.),
+):
+    """
+    GIF of the Chirp Game orbit animation, rasterized with NumPy. It
+    loops forever, so periodic orbits are only rendered for one period.
+
+    The frames line up with a plt.subplots(figsize=figsize) figure
+    whose axes span [-1,1] in x and y, as the matplotlib version did.
+
+    Returns
+    -------
+    bytes of the GIF file
+    """
+    b = chirp_game_binary(m1,m2,alpha,beta,gamma,fps,length)
+    extent = rasterizer.figure_extent(figsize=figsize)
+    frames = rasterizer.rasterize_binary(
+        b.pos1_projected,b.pos2_projected,
+        b.m1,b.m2,BH_scale,
+        **extent
+    )
+    # only the area around the two black holes changes between frames
+    boxes = rasterizer.dirty_boxes(
+        b.pos1_projected,b.pos2_projected,
+        b.m1,b.m2,BH_scale,
+        **extent
+    )
+    return animation_writer.encode_gif_delta(frames,fps,boxes)
+
+def render_orbit_matplotlib(
+    m1,m2,
+    alpha = 50.,beta = 20.,gamma = 95.,
+    fps = 30.,length = 8.,
+    BH_scale = 1./100,
+    figsize = (4.,4.),
+):
+    """
+    GIF of the Chirp Game orbit animation drawn with BinaryBlackHole
+    artists.
+
+    The figure is a standalone Figure with its own Agg canvas rather
+    than a pyplot figure, so it shares no global state and needs no
+    lock: any number of these can render at once in different threads.
+
+    Returns
+    -------
+    bytes of the GIF file
+    """
+    b = chirp_game_binary(m1,m2,alpha,beta,gamma,fps,length)
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_axis_off()
+
+    # make BBH artist
+    bbh = artists.BinaryBlackHole(
+        binary = b,
+        ax = ax,
+        name = 'orbit',
+        BH_scale = BH_scale
+    )
+
+    def init():
+        artist_dict = bbh.setup_artists()
+        ax.set_xlim([-1,1])
+        ax.set_ylim([-1,1])
+        return artist_dict
+
+    return animation_writer.encode_gif(
+        animation_writer.blit_frames(fig,bbh.get_artists,b.n_frames,init=init),
+        fps
+    )
+
+def merger_binary(
+    m1,m2,
+    alpha = 50.,beta = 20.,gamma = 95.,
+    n_frames = 180,
+    r_start = 4.,
+):
+    """
+    The InspiralingBinary for the inspiral part of a merger animation.
+
+    Parameters
+    ----------
+    m1,m2: floats
+        black hole masses in solar masses
+    alpha,beta,gamma: floats
+        viewing angles in degrees
+    n_frames: int
+        number of inspiral frames
+    r_start: float
+        separation at the first frame, in units of the separation
+        at merger
+
+    Returns
+    -------
+    InspiralingBinary holding the last orbits before the merger
+    """
+    b = binary.InspiralingBinary(
+        m1 = m1,
+        m2 = m2,
+        alpha = alpha,
+        beta = beta,
+        gamma = gamma,
+        )
+    b.final_orbits(n_frames,r_start*b.rmax)
+    return b
+
+def render_merger(
+    m1,m2,
+    alpha = 50.,beta = 20.,gamma = 95.,
+    fps = 30.,length = 8.,
+    ringdown_fraction = 0.25,
+    r_start = 4.,
+    ringdown_amplitude = 0.3,
+    figsize = (4.,4.),
+):
+    """
+    GIF of a whole binary black hole merger: the last orbits of the
+    inspiral drawn with BinaryBlackHole, then the remnant settling down
+    as a BlackHoleRingdown.
+
+    Both parts share one budget of length*fps frames, and the ringdown
+    oscillation is precomputed for all its frames. The black holes are
+    drawn to scale, so that they touch at the merger.
+
+    Parameters
+    ----------
+    m1,m2: floats
+        black hole masses in solar masses
+    alpha,beta,gamma: floats
+        viewing angles in degrees
+    fps: float
+        frames per second
+    length: float
+        length of the animation in seconds
+    ringdown_fraction: float
+        share of the frames spent on the ringdown, from 0 for no
+        ringdown up to but not including 1
+    r_start: float
+        separation at the first frame, in units of the separation
+        at merger
+    ringdown_amplitude: float
+        initial fractional distortion of the remnant
+    figsize: tuple
+        figure size in inches
+
+    Returns
+    -------
+    bytes of the GIF file
+    """
+    if not 0. <= ringdown_fraction < 1.:
+        raise ValueError('ringdown_fraction must be at least 0 and below 1')
+    n_frames = int(length*fps)
+    n_ringdown = int(round(ringdown_fraction*n_frames))
+    n_inspiral = n_frames - n_ringdown
+    b = merger_binary(m1,m2,alpha,beta,gamma,n_inspiral,r_start)
+
+    # radii that add up to the separation at merger
+    BH_scale = b.rmax/(b.m1 + b.m2)
+    extent = r_start*b.rmax*max(b.m1,b.m2)/(b.m1 + b.m2) + BH_scale*max(b.m1,b.m2)
+
+    fig = Figure(figsize=figsize)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    ax.set_axis_off()
+
+    bbh = artists.BinaryBlackHole(
+        binary = b,
+        ax = ax,
+        name = 'inspiral',
+        BH_scale = BH_scale
+    )
+    remnant = None
+    if n_ringdown:
+        # Ellipse sizes are diameters
+        remnant = artists.BlackHoleRingdown(
+            M = b.m1 + b.m2,
+            amplitude0 = ringdown_amplitude,
+            omega = None,
+            tau = n_ringdown/4.,
+            ax = ax,
+            name = 'remnant',
+            BH_scale = 2.*BH_scale
+        )
+        remnant.bind(n_ringdown)
+
+    def init():
+        artist_dict = dict(bbh.setup_artists())
+        if remnant is not None:
+            artist_dict.update(remnant.setup_artists())
+        ax.set_xlim([-extent,extent])
+        ax.set_ylim([-extent,extent])
+        ax.set_aspect('equal')
+        return artist_dict
+
+    def animate(i):
+        inspiralling = i < n_inspiral
+        for artist in bbh.artists.values():
+            artist.set_visible(inspiralling)
+        if remnant is not None:
+            for artist in remnant.artists.values():
+                artist.set_visible(not inspiralling)
+        artist_dict = dict(bbh.artists)
+        if inspiralling:
+            artist_dict.update(bbh.get_artists(i))
+        else:
+            artist_dict.update(remnant.get_artists(i - n_inspiral))
+        return artist_dict
+
+    return animation_writer.encode_gif(
+        animation_writer.blit_frames(fig,animate,n_frames,init=init),
+        fps
+    )
+
+RENDERERS = {
+    'raster': render_orbit,
+    'matplotlib': render_orbit_matplotlib,
+    'merger': render_merger,
+}
+
+def render_orbit_html(
+    m1,m2,
+    alpha = 50.,beta = 20.,gamma = 95.,
+    fps = 30.,length = 8.,
+    BH_scale = 1./100,
+    figsize = (4.,4.),
+):
+    """
+    The Chirp Game orbit animation as a small HTML canvas component
+    that animates the trajectory in the browser.
+
+    Returns
+    -------
+    html: str
+        for streamlit.components.v1.html
+    height: int
+        height of the canvas in pixels
+    """
+    b = chirp_game_binary(m1,m2,alpha,beta,gamma,fps,length)
+    extent = rasterizer.figure_extent(figsize=figsize)
+    payload = client_animation.orbit_payload(b,BH_scale,fps,**extent)
+    return client_animation.orbit_html(payload),payload['height']
@@ -0,0 +1,174 @@
+"""
+Prebuilt Chirp Game orbit animations.
+
+The Chirp Game mass sliders take integer values from 5 to 50 and the
+other animation settings are fixed, so every animation the page can
+show is known in advance. Swapping m1 and m2 only shifts the orbit by
+half a period, so one animation per unordered pair of masses is
+enough: 1,081 in all.
+
+    python orbit_atlas.py                  # build into temp/orbit_atlas
+    python orbit_atlas.py --processes 8 --directory some/where
+
+Each GIF is stored under the SHA-256 of its bytes, and index.json maps
+the animation parameters to those hashes.
+"""
+
+import os
+import sys
+import json
+import hashlib
+import inspect
+import argparse
+import tempfile
+import itertools
+import multiprocessing
+
+import orbit_animation
+
+# the Chirp Game sliders
+MASSES = range(5,51)
+
+def mass_pairs(masses = MASSES):
+    """
+    every unordered pair of slider masses, once each, as (m1,m2) with
+    m1 <= m2
+    """
+    return list(itertools.combinations_with_replacement(masses,2))
+
+def sorted_masses(m1,m2):
+    """
+    m1 and m2 in the order mass_pairs gives them
+    """
+    return tuple(sorted((m1,m2)))
+
+DEFAULT_DIRECTORY = 'temp/orbit_atlas'
+
+# render_orbit's defaults, so that keys do not depend on which
+# arguments were spelled out
+RENDER_DEFAULTS = {
+    name: p.default
+    for name,p in inspect.signature(orbit_animation.render_orbit).parameters.items()
+    if p.default is not p.empty
+}
+
+def atlas_key(m1,m2,**render_kwargs):
+    """
+    index key of an animation; the masses are put in order since
+    swapping them gives the same animation
+    """
+    params = dict(RENDER_DEFAULTS,**render_kwargs)
+    params['m1'],params['m2'] = sorted_masses(m1,m2)
+    params = {
+        k: [float(x) for x in v] if isinstance(v,(tuple,list)) else float(v)
+        for k,v in params.items()
+    }
+    return json.dumps(params,sort_keys=True)
+
+def _atomic_write(path,data):
+    directory = os.path.dirname(path)
+    os.makedirs(directory,exist_ok=True)
+    fd,tmp = tempfile.mkstemp(dir=directory,prefix='.tmp-')
+    with os.fdopen(fd,'wb') as f:
+        f.write(data)
+    os.replace(tmp,path)
+
+class OrbitAtlas:
+
+    """
+    Read side of the atlas: looks animations up in the index. Misses
+    are rendered live by render_service.RenderService.
+    """
+
+    def __init__(self,directory = DEFAULT_DIRECTORY):
+        """
+        Parameters
+        ----------
+        directory: str
+            where the atlas was built; a missing atlas is treated as
+            empty, so every lookup misses
+
+        Returns
+        -------
+        None
+        """
+        self.directory = directory
+        try:
+            with open(os.path.join(directory,'index.json')) as f:
+                self.index = json.load(f)
+        except FileNotFoundError:
+            self.index = {}
+
+    def __len__(self):
+        return len(self.index)
+
+    def path(self,digest):
+        return os.path.join(self.directory,digest[:2],digest + '.gif')
+
+    def get(self,m1,m2,**render_kwargs):
+        """
+        Returns
+        -------
+        bytes of the prebuilt GIF, or None if it is not in the atlas
+        """
+        digest = self.index.get(atlas_key(m1,m2,**render_kwargs))
+        if digest is None:
+            return None
+        try:
+            with open(self.path(digest),'rb') as f:
+                return f.read()
+        except FileNotFoundError:
+            return None
+
+def _build_one(job):
+    directory,m1,m2,render_kwargs = job
+    gif = orbit_animation.render_orbit(m1,m2,**render_kwargs)
+    digest = hashlib.sha256(gif).hexdigest()
+    path = os.path.join(directory,digest[:2],digest + '.gif')
+    if not os.path.exists(path):
+        _atomic_write(path,gif)
+    return atlas_key(m1,m2,**render_kwargs),digest
+
+def build(directory = DEFAULT_DIRECTORY,processes = None,masses = MASSES,**render_kwargs):
+    """
+    Render every unordered pair of masses in parallel into directory
+    and write its index.
+
+    Parameters
+    ----------
+    directory: str
+        where to put the atlas
+    processes: int, optional
+        number of worker processes, defaults to the number of CPUs
+    masses: iterable of numbers
+        slider values for each mass
+    render_kwargs:
+        passed to orbit_animation.render_orbit for every animation
+
+    Returns
+    -------
+    dict mapping keys to content hashes, as written to index.json
+    """
+    jobs = [(directory,m1,m2,render_kwargs) for m1,m2 in mass_pairs(masses)]
+    with multiprocessing.Pool(processes) as pool:
+        index = dict(pool.imap_unordered(_build_one,jobs,chunksize=8))
+    _atomic_write(os.path.join(directory,'index.json'),
+        json.dumps(index,sort_keys=True,indent=0).encode())
+    return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--directory',default=DEFAULT_DIRECTORY,
+        help='where to write the atlas')
+    parser.add_argument('--processes',type=int,default=None,
+        help='number of worker processes')
+    args = parser.parse_args(argv)
+
+    index = build(args.directory,processes=args.processes)
+    print('{} animations, {} unique files in {}'.format(
+        len(index),len(set(index.values())),args.directory))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+import numpy as np
+
+def figure_extent(
+    figsize = (4.,4.),
+    dpi = 100.,
+    xlim = (-1.,1.),
+    ylim = (-1.,1.),
+    left = 0.125,right = 0.9,
+    bottom = 0.11,top = 0.88,
+):
+    """
+    Pixel size and data limits of a whole figure whose axes span xlim
+    and ylim, so that rasterized frames line up with what matplotlib
+    draws for plt.subplots(figsize=figsize). The subplot margins
+    default to matplotlib's.
+
+    Returns
+    -------
+    dict with shape, xlim and ylim, to pass to rasterize_binary
+    """
+    x_per_fig = (xlim[1] - xlim[0])/(right - left)
+    y_per_fig = (ylim[1] - ylim[0])/(top - bottom)
+    return dict(
+        shape = (int(round(figsize[1]*dpi)),int(round(figsize[0]*dpi))),
+        xlim = (xlim[0] - left*x_per_fig,xlim[0] + (1. - left)*x_per_fig),
+        ylim = (ylim[0] - bottom*y_per_fig,ylim[0] + (1. - bottom)*y_per_fig),
+    )
+
+def _pixel_scales(shape,xlim,ylim):
+    height,width = shape
+    return (xlim[1] - xlim[0])/width,(ylim[1] - ylim[0])/height
+
+def _window_size(radius,edge_width,aspect,shape):
+    # every circle is drawn within a square window around its centre,
+    # sized for its own radius and slid inwards where it would cross
+    # the edge of the frame
+    height,width = shape
+    size = int(np.ceil(2.*(radius + edge_width)*max(1.,1./aspect))) + 3
+    return min(size,height),min(size,width)
+
+def _window_corners(pos,size_y,size_x,shape,xlim,ylim):
+    """
+    fractional (row,column) centres of circles at projected positions
+    pos, and the top left corners of their windows
+    """
+    height,width = shape
+    x_scale,y_scale = _pixel_scales(shape,xlim,ylim)
+    row = (ylim[1] - pos[...,2])/y_scale - 0.5
+    col = (pos[...,1] - xlim[0])/x_scale - 0.5
+    row0 = np.clip(np.floor(row - 0.5*size_y) + 1,0,height - size_y).astype(int)
+    col0 = np.clip(np.floor(col - 0.5*size_x) + 1,0,width - size_x).astype(int)
+    return row,col,row0,col0
+
+def dirty_boxes(
+    pos1_projected,pos2_projected,
+    m1,m2,BH_scale,
+    shape = (400,400),
+    xlim = (-1.,1.),
+    ylim = (-1.,1.),
+    edge_width = 100./72,
+):
+    """
+    The region of each frame of rasterize_binary that can differ from
+    the frame before, worked out from the trajectory alone: the windows
+    both circles are drawn in, in this frame and the previous one. The
+    first frame is dirty everywhere.
+
+    Parameters are those of rasterize_binary.
+
+    Returns
+    -------
+    int array of shape (n_frames,4) of (left,upper,right,lower) pixel
+    boxes, as PIL crops them
+    """
+    height,width = shape
+    x_scale,y_scale = _pixel_scales(shape,xlim,ylim)
+
+    # (2,n_frames) window edges of both black holes
+    edges = []
+    for pos,m in ((pos1_projected,m1),(pos2_projected,m2)):
+        size_y,size_x = _window_size(BH_scale*m/x_scale,edge_width,y_scale/x_scale,shape)
+        _,_,row0,col0 = _window_corners(pos,size_y,size_x,shape,xlim,ylim)
+        edges.append((col0,row0,col0 + size_x,row0 + size_y))
+    (left1,upper1,right1,lower1),(left2,upper2,right2,lower2) = edges
+    left,upper = np.minimum(left1,left2),np.minimum(upper1,upper2)
+    right,lower = np.maximum(right1,right2),np.maximum(lower1,lower2)
+
+    boxes = np.empty((len(pos1_projected),4),dtype=int)
+    boxes[1:,0] = np.minimum(left[1:],left[:-1])
+    boxes[1:,1] = np.minimum(upper[1:],upper[:-1])
+    boxes[1:,2] = np.maximum(right[1:],right[:-1])
+    boxes[1:,3] = np.maximum(lower[1:],lower[:-1])
+    boxes[:1] = (0,0,width,height)
+    return boxes
+
+def rasterize_binary(
+    pos1_projected,pos2_projected,
+    m1,m2,BH_scale,
+    shape = (400,400),
+    xlim = (-1.,1.),
+    ylim = (-1.,1.),
+    edge_width = 100./72,
+    background = 255,
+    facecolor = 0,
+    edgecolor = 255,
+    chunk_size = 16,
+):
+    """
+    Draw a binary black hole animation straight into a grayscale frame
+    stack, without matplotlib.
+
+    Each black hole is a filled circle of radius BH_scale*mass with an
+    edge ring centred on the radius, as BinaryBlackHole draws it, and
+    the one with the larger z is drawn on top. Edges are anti-aliased
+    by pixel coverage. Distances are only evaluated in a window around
+    each circle, for all frames of a chunk at once.
+
+    Parameters
+    ----------
+    pos1_projected,pos2_projected: arrays of shape (n_frames,3)
+        projected (z,x,y) positions, e.g. from Binary
+    m1,m2: floats
+        masses of the black holes
+    BH_scale: float
+        radius of a black hole per solar mass, in data units
+    shape: tuple
+        (height,width) of the frames in pixels
+    xlim,ylim: tuples
+        data coordinates at the edges of the frame
+    edge_width: float
+        width of the edge ring in pixels, 1 pt at 100 dpi by default
+    background,facecolor,edgecolor: ints
+        gray levels of the background, black holes and edge rings
+    chunk_size: int
+        number of frames rasterized per vectorized pass
+
+    Returns
+    -------
+    array of shape (n_frames,height,width), dtype uint8
+    """
+    height,width = shape
+    n_frames = len(pos1_projected)
+    frames = np.full((n_frames,height,width),background,dtype=np.uint8)
+
+    # work in pixel units: centres as fractional (row,column) indices
+    x_scale,y_scale = _pixel_scales(shape,xlim,ylim)
+    aspect = np.float32(y_scale/x_scale)
+    half_edge = np.float32(0.5*edge_width)
+
+    # each black hole is drawn in a window sized for its own radius
+    bodies = []
+    for pos,m in ((pos1_projected,m1),(pos2_projected,m2)):
+        radius = BH_scale*m/x_scale
+        size_y,size_x = _window_size(radius,edge_width,aspect,shape)
+        # every (size_y,size_x) window of every frame, as a writable view
+        windows = np.lib.stride_tricks.as_strided(frames,
+            shape = (n_frames,height - size_y + 1,width - size_x + 1,size_y,size_x),
+            strides = frames.strides + frames.strides[1:],
+        )
+        offsets = np.arange(size_y,dtype=np.float32),np.arange(size_x,dtype=np.float32)
+        bodies.append((pos,np.float32(radius),size_y,size_x,offsets,windows))
+
+    # make sure star that is closer is shown on top of the other
+    front1 = pos1_projected[:,0] > pos2_projected[:,0]
+
+    for start in range(0,n_frames,chunk_size):
+        stop = min(start + chunk_size,n_frames)
+        front = front1[start:stop]
+        # back layer first, then front; in each frame one black hole is
+        # in each layer
+        for layer in (False,True):
+            for is1,(pos,radius,size_y,size_x,offsets,windows) in zip((True,False),bodies):
+                index = start + np.flatnonzero((front == layer) == is1)
+                if not len(index):
+                    continue
+                row,col,row0,col0 = _window_corners(pos[index],size_y,size_x,shape,xlim,ylim)
+
+                offsets_y,offsets_x = offsets
+                dy = (row0 - row)[:,None,None].astype(np.float32) + offsets_y[None,:,None]
+                dx = (col0 - col)[:,None,None].astype(np.float32) + offsets_x[None,None,:]
+                # circles in data coordinates, which may not be square pixels
+                dy *= aspect
+                dist = np.sqrt(dy*dy + dx*dx)
+                # fraction of each pixel inside the outer and inner edge of the ring
+                np.subtract(radius + np.float32(0.5),dist,out=dist)
+                outer = np.clip(dist + half_edge,0.,1.)
+                inner = np.clip(dist - half_edge,0.,1.,out=dist)
+
+                window = windows[index,row0,col0].astype(np.float32)
+                window += (np.float32(edgecolor) - window)*outer
+                window += (np.float32(facecolor) - window)*inner
+                windows[index,row0,col0] = np.rint(window,out=window)
+    return frames
@@ -0,0 +1,141 @@
+"""
+Orbit animations rendered in worker processes.
+
+A Streamlit script runs top to bottom, so rendering an animation in
+the script thread holds up everything below it. RenderService hands
+the job to a process pool and returns a future right away; the page
+leaves a placeholder where the animation goes, renders the rest of its
+content, and fills the placeholder in once the future is done.
+
+    service = RenderService()
+    job = service.resubmit(st.session_state.get('orbit_job'), m1, m2)
+    st.session_state['orbit_job'] = job
+    ...
+    placeholder.image(job.result())
+"""
+
+import os
+import threading
+import multiprocessing
+import concurrent.futures
+from concurrent.futures.process import BrokenProcessPool
+
+import orbit_animation
+
+class RenderService:
+
+    """
+    Process pool that renders orbit_animation GIFs and returns futures.
+
+    Jobs build a binary.Binary and rasterize it with
+    orbit_animation.render_orbit by default, the renderer the atlas was
+    built with, so live renders look exactly like prebuilt ones. Any
+    other key of orbit_animation.RENDERERS can be given per job.
+
+    Workers are started with the spawn method, since forking the
+    multi-threaded Streamlit server can deadlock the child. A pool that
+    breaks, e.g. because a worker was killed, is replaced on the next
+    submit.
+    """
+
+    def __init__(self,max_workers = None,renderer = 'raster'):
+        """
+        Parameters
+        ----------
+        max_workers: int, optional
+            number of worker processes, defaults to the number of CPUs
+        renderer: str
+            key of orbit_animation.RENDERERS used for jobs that do not
+            name one
+
+        Returns
+        -------
+        None
+        """
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.renderer = renderer
+        # started on the first job, so that importing the page does not
+        # start a pool
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ProcessPoolExecutor(
+                    self.max_workers,
+                    mp_context = multiprocessing.get_context('spawn'),
+                )
+            return self._executor
+
+    def _discard(self,executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False,cancel_futures=True)
+
+    def job_params(self,m1,m2,renderer=None,**render_kwargs):
+        return (renderer or self.renderer,m1,m2) + tuple(sorted(render_kwargs.items()))
+
+    def submit(self,m1,m2,renderer=None,**render_kwargs):
+        """
+        Queue an animation.
+
+        Parameters
+        ----------
+        m1,m2: floats
+            black hole masses in solar masses
+        renderer: str, optional
+            key of orbit_animation.RENDERERS, defaults to the service's
+        render_kwargs:
+            passed on to the renderer
+
+        Returns
+        -------
+        concurrent.futures.Future whose result is the GIF bytes; its
+        params attribute identifies the job for resubmit
+        """
+        render = orbit_animation.RENDERERS[renderer or self.renderer]
+        executor = self.executor
+        try:
+            future = executor.submit(render,m1,m2,**render_kwargs)
+        except BrokenProcessPool:
+            # a worker died and took the pool with it; start a new one
+            self._discard(executor)
+            future = self.executor.submit(render,m1,m2,**render_kwargs)
+        future.params = self.job_params(m1,m2,renderer,**render_kwargs)
+        return future
+
+    def resubmit(self,previous,m1,m2,renderer=None,**render_kwargs):
+        """
+        Like submit, but reuse previous if it is the same job and has
+        not failed, and cancel it otherwise, since its animation will
+        not be shown.
+
+        Only jobs still waiting in the queue can be cancelled; one a
+        worker has started runs to completion and its result is dropped.
+
+        Parameters
+        ----------
+        previous: Future or None
+            the last job submitted for this placeholder, e.g. kept in
+            st.session_state across reruns
+
+        Returns
+        -------
+        concurrent.futures.Future
+        """
+        params = self.job_params(m1,m2,renderer,**render_kwargs)
+        if previous is not None:
+            if getattr(previous,'params',None) == params and not previous.cancelled():
+                if not previous.done() or previous.exception() is None:
+                    return previous
+            previous.cancel()
+        return self.submit(m1,m2,renderer,**render_kwargs)
+
+    def shutdown(self,wait = True):
+        with self._lock:
+            executor,self._executor = self._executor,None
+        if executor is not None:
+            executor.shutdown(wait=wait,cancel_futures=True)
@@ -0,0 +1,201 @@
+"""
+Prebuilt IMRPhenomD waveforms for the Chirp Game mass sliders.
+
+The sliders take integer masses from 5 to 50 and the other waveform
+parameters are fixed, so every waveform the page can ask for is known
+in advance. IMRPhenomD only models the dominant (2,2) mode, which does
+not change when the two masses are swapped, so one waveform per
+unordered pair of masses is enough: 1,081 in all.
+
+    python template_bank.py                  # build into temp/template_bank
+    python template_bank.py --processes 8 --directory some/where
+
+All waveforms are stored back to back in one (2,n_samples) array in
+waveforms.npy, the plus polarization in the first row and the cross
+polarization in the second. index.json holds the waveform parameters
+and, for every pair of masses, the offset and length of its samples
+and its epoch. The page memory-maps the array and reads its waveform
+as a slice, without copying it or calling lalsimulation.
+"""
+
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import multiprocessing
+import numpy as np
+
+from orbit_atlas import MASSES,mass_pairs,sorted_masses
+
+# the Chirp Game waveform settings
+WAVEFORM_PARAMS = dict(
+    approximant = 'IMRPhenomD',
+    coa_phase = np.pi,
+    delta_t = 1.0/2048,
+    f_lower = 20.,
+)
+
+DEFAULT_DIRECTORY = 'temp/template_bank'
+
+def bank_key(m1,m2):
+    """
+    index key of a template, the same for both orders of the masses
+    since IMRPhenomD's (2,2) mode does not change when they are swapped
+    """
+    m1,m2 = sorted_masses(int(m1),int(m2))
+    return '{},{}'.format(m1,m2)
+
+class TemplateBank:
+
+    """
+    Read side of the bank: looks waveforms up in the index and returns
+    read-only views of the memory-mapped array.
+    """
+
+    def __init__(self,directory = DEFAULT_DIRECTORY):
+        """
+        Parameters
+        ----------
+        directory: str
+            where the bank was built; if it has not been built, the
+            bank is empty and covers nothing, so every waveform is
+            generated
+
+        Returns
+        -------
+        None
+        """
+        self.directory = directory
+        try:
+            with open(os.path.join(directory,'index.json')) as f:
+                index = json.load(f)
+            self.params = index['params']
+            self.templates = index['templates']
+            self.waveforms = np.load(os.path.join(directory,'waveforms.npy'),mmap_mode='r')
+        except FileNotFoundError:
+            self.params = {}
+            self.templates = {}
+            self.waveforms = None
+
+    def __len__(self):
+        return len(self.templates)
+
+    def covers(self,approximant,mass1,mass2,coa_phase,delta_t,f_lower):
+        """
+        whether these get_td_waveform parameters are in the bank
+        """
+        params = dict(approximant=approximant,coa_phase=coa_phase,
+                      delta_t=delta_t,f_lower=f_lower)
+        return (
+            params == self.params
+            and float(mass1).is_integer() and float(mass2).is_integer()
+            and bank_key(mass1,mass2) in self.templates
+        )
+
+    def get(self,m1,m2):
+        """
+        Returns
+        -------
+        hp,hc: read-only array views into the bank
+        epoch: (GPS seconds, nanoseconds) of the first sample
+        or None if the masses are not in the bank
+        """
+        entry = self.templates.get(bank_key(m1,m2))
+        if entry is None:
+            return None
+        offset,length,gps_seconds,gps_nanoseconds = entry
+        hp,hc = self.waveforms[:,offset:offset+length]
+        return hp,hc,(gps_seconds,gps_nanoseconds)
+
+def _generate(m1m2):
+    from pycbc.waveform import get_td_waveform
+    m1,m2 = m1m2
+    hp,hc = get_td_waveform(mass1=m1,mass2=m2,**WAVEFORM_PARAMS)
+    epoch = (int(hp.start_time.gpsSeconds),int(hp.start_time.gpsNanoSeconds))
+    return bank_key(m1,m2),hp.numpy(),hc.numpy(),epoch
+
+def build(directory = DEFAULT_DIRECTORY,processes = None,masses = MASSES):
+    """
+    Generate the waveform of every unordered pair of masses in
+    parallel and store them as one memory-mappable array with an index.
+
+    The bank is written to a temporary directory and renamed into
+    place, replacing any previous bank, so readers never see a partial
+    one.
+
+    Parameters
+    ----------
+    directory: str
+        where to put the bank
+    processes: int, optional
+        number of worker processes, defaults to the number of CPUs
+    masses: iterable of integers
+        slider values for each mass
+
+    Returns
+    -------
+    dict of the index, as written to index.json
+    """
+    parent = os.path.dirname(os.path.abspath(directory))
+    os.makedirs(parent,exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent,prefix='.tmp-')
+    try:
+        # append each waveform as it arrives, then lay the two
+        # polarizations out as the rows of one array
+        templates = {}
+        offset = 0
+        pairs = mass_pairs(masses)
+        with open(os.path.join(tmp,'hp.raw'),'wb') as f_hp,\
+             open(os.path.join(tmp,'hc.raw'),'wb') as f_hc,\
+             multiprocessing.Pool(processes) as pool:
+            for key,hp,hc,epoch in pool.imap(_generate,pairs,chunksize=4):
+                f_hp.write(np.ascontiguousarray(hp,dtype='<f8').tobytes())
+                f_hc.write(np.ascontiguousarray(hc,dtype='<f8').tobytes())
+                templates[key] = [offset,len(hp)] + list(epoch)
+                offset += len(hp)
+
+        waveforms = np.lib.format.open_memmap(os.path.join(tmp,'waveforms.npy'),
+            mode='w+',dtype='<f8',shape=(2,offset))
+        for row,name in enumerate(('hp.raw','hc.raw')):
+            path = os.path.join(tmp,name)
+            if offset:
+                waveforms[row] = np.memmap(path,dtype='<f8',mode='r',shape=(offset,))
+            os.remove(path)
+        waveforms.flush()
+        del waveforms
+
+        index = dict(params=WAVEFORM_PARAMS,templates=templates)
+        with open(os.path.join(tmp,'index.json'),'w') as f:
+            json.dump(index,f,sort_keys=True,indent=0)
+
+        if os.path.isdir(directory):
+            old = tempfile.mkdtemp(dir=parent,prefix='.old-')
+            os.rename(directory,os.path.join(old,'bank'))
+            os.rename(tmp,directory)
+            shutil.rmtree(old,ignore_errors=True)
+        else:
+            os.rename(tmp,directory)
+    except BaseException:
+        shutil.rmtree(tmp,ignore_errors=True)
+        raise
+    return index
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--directory',default=DEFAULT_DIRECTORY,
+        help='where to write the bank')
+    parser.add_argument('--processes',type=int,default=None,
+        help='number of worker processes')
+    args = parser.parse_args(argv)
+
+    index = build(args.directory,processes=args.processes)
+    size = os.path.getsize(os.path.join(args.directory,'waveforms.npy'))
+    print('{} templates, {:.1f} MiB in {}'.format(
+        len(index['templates']),size/1024.**2,args.directory))
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
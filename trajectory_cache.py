@@ -0,0 +1,169 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+
+class TrajectoryCache:
+
+    """
+    A size-bounded on-disk cache of evolved Binary trajectories.
+
+    Each entry is a directory named by a content hash of the binary's
+    parameters, holding one .npy file per array and a meta.json. Arrays
+    are read back memory-mapped, so processes sharing the directory
+    share pages instead of copies. Entries are written to a temporary
+    directory and renamed into place, so readers never see a partial
+    entry, and the least recently used entries are evicted once the
+    cache grows past max_bytes.
+    """
+
+    def __init__(self,
+        directory = 'temp/trajectories',
+        max_bytes = 256*1024**2,
+    ):
+        """
+        Parameters
+        ----------
+        directory: str
+            where to keep the cache entries, created if missing
+        max_bytes: int
+            total size of the entries above which the least recently
+            used ones are removed
+
+        Returns
+        -------
+        None
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(self.directory,exist_ok=True)
+
+    @staticmethod
+    def key(kind,params):
+        """
+        content hash of an operation and the parameters it ran with
+        """
+        blob = json.dumps([kind,params],sort_keys=True)
+        return hashlib.sha256(blob.encode()).hexdigest()
+
+    def path(self,key):
+        return os.path.join(self.directory,key)
+
+    def get(self,key):
+        """
+        Returns
+        -------
+        arrays,meta: dict of read-only memory-mapped arrays and the
+            metadata stored with them, or None if the key is missing
+        """
+        path = self.path(key)
+        try:
+            with open(os.path.join(path,'meta.json')) as f:
+                meta = json.load(f)
+            arrays = {
+                name: np.load(os.path.join(path,name+'.npy'),mmap_mode='r')
+                for name in meta['arrays']
+            }
+            # mark as recently used
+            os.utime(path)
+        except FileNotFoundError:
+            # missing, or evicted while we were reading it
+            return None
+        return arrays,meta
+
+    def put(self,key,arrays,meta=None):
+        """
+        Atomically store a dict of arrays (and JSON-able metadata)
+        under key, then evict old entries if over budget.
+        """
+        meta = dict(meta or {})
+        meta['arrays'] = sorted(arrays)
+        tmp = tempfile.mkdtemp(dir=self.directory,prefix='.tmp-')
+        try:
+            for name,array in arrays.items():
+                np.save(os.path.join(tmp,name+'.npy'),np.ascontiguousarray(array))
+            with open(os.path.join(tmp,'meta.json'),'w') as f:
+                json.dump(meta,f)
+            os.rename(tmp,self.path(key))
+        except OSError:
+            # another process stored the same entry first
+            shutil.rmtree(tmp,ignore_errors=True)
+            if not os.path.isdir(self.path(key)):
+                raise
+        self.evict(keep=key)
+
+    def entries(self):
+        """
+        (last used, size in bytes, key) for every complete entry
+        """
+        entries = []
+        for key in os.listdir(self.directory):
+            if key.startswith('.'):
+                continue
+            path = self.path(key)
+            try:
+                size = sum(
+                    os.path.getsize(os.path.join(path,f)) for f in os.listdir(path)
+                )
+                entries.append((os.path.getmtime(path),size,key))
+            except FileNotFoundError:
+                continue
+        return entries
+
+    def evict(self,keep=None):
+        """
+        Remove least recently used entries until the cache fits in
+        max_bytes, never removing the entry named keep.
+        """
+        entries = sorted(self.entries())
+        total = sum(size for _,size,_ in entries)
+        for _,size,key in entries:
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            shutil.rmtree(self.path(key),ignore_errors=True)
+            total -= size
+
+    def evolve(self,binary,n_steps=1):
+        """
+        binary.evolve(n_steps), reading the frames from the cache when
+        the same orbit has been evolved before.
+        """
+        key = self.key('evolve',dict(binary.params,
+            kind=type(binary).__name__,n_steps=n_steps
+        ))
+        cached = self.get(key)
+        if cached is not None:
+            arrays,meta = cached
+            binary.load_frames(arrays['trajectory'],meta['phase1'])
+            return
+        n0 = binary.n_frames
+        binary.evolve(n_steps)
+        self.put(key,
+            {'trajectory': binary.trajectory[n0:]},
+            {'phase1': float(binary.phase1)}
+        )
+
+    def inspiral(self,binary,**kwargs):
+        """
+        binary.inspiral(**kwargs) for an InspiralingBinary, reading the
+        frames and their times from the cache when available.
+        """
+        key = self.key('inspiral',dict(binary.params,
+            kind=type(binary).__name__,**kwargs
+        ))
+        cached = self.get(key)
+        if cached is not None:
+            arrays,meta = cached
+            binary.load_frames(arrays['trajectory'],meta['phase1'])
+            binary.t = np.concatenate((binary.t,arrays['t']))
+            return
+        n0 = binary.n_frames
+        binary.inspiral(**kwargs)
+        self.put(key,
+            {'trajectory': binary.trajectory[n0:],'t': np.asarray(binary.t)[n0:]},
+            {'phase1': float(binary.phase1)}
+        )
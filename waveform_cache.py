@@ -0,0 +1,144 @@
+import threading
+from collections import OrderedDict
+import numpy as np
+
+import lal
+from pycbc.types import TimeSeries
+from pycbc.waveform import get_td_waveform
+
+class WaveformCache:
+
+    """
+    An in-memory cache of get_td_waveform results, bounded by the total
+    size of the stored waveforms.
+
+    Entries hold plain NumPy arrays and the epoch as integer GPS seconds
+    and nanoseconds, rather than pycbc TimeSeries and lal.LIGOTimeGPS
+    objects, so nothing needs special hashing or pickling. A hit builds
+    fresh TimeSeries from copies of the arrays, so callers may modify
+    or resize what they get. The least recently used waveforms are
+    dropped once the cache grows past max_bytes. One cache can be
+    shared by all sessions; lookups are thread-safe.
+
+    Waveforms in a prebuilt template_bank.TemplateBank are read from
+    it instead, as read-only views of its memory map, and never enter
+    the cache.
+    """
+
+    def __init__(self,max_bytes = 128*1024**2,bank = None):
+        """
+        Parameters
+        ----------
+        max_bytes: int
+            total size of the cached arrays above which the least
+            recently used waveforms are removed
+        bank: TemplateBank, optional
+            prebuilt waveforms to serve before generating any
+
+        Returns
+        -------
+        None
+        """
+        self.max_bytes = max_bytes
+        self.bank = bank
+        self.bank_hits = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.nbytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    @staticmethod
+    def key(approximant,mass1,mass2,coa_phase,delta_t,f_lower):
+        return (str(approximant),float(mass1),float(mass2),
+                float(coa_phase),float(delta_t),float(f_lower))
+
+    @property
+    def stats(self):
+        """
+        hit and miss counters, evictions and current size
+        """
+        with self._lock:
+            return dict(
+                bank_hits = self.bank_hits,
+                hits = self.hits,
+                misses = self.misses,
+                evictions = self.evictions,
+                entries = len(self._entries),
+                nbytes = self.nbytes,
+            )
+
+    def _lookup(self,key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def _store(self,key,entry):
+        nbytes = entry['hp'].nbytes + entry['hc'].nbytes
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                return
+            self._entries[key] = entry
+            self.nbytes += nbytes
+            while self.nbytes > self.max_bytes:
+                _,old = self._entries.popitem(last=False)
+                self.nbytes -= old['hp'].nbytes + old['hc'].nbytes
+                self.evictions += 1
+
+    def get_td_waveform(self,approximant,mass1,mass2,coa_phase,delta_t,f_lower):
+        """
+        pycbc.waveform.get_td_waveform for the given parameters,
+        generated only if they are not in the cache.
+
+        Returns
+        -------
+        hp,hc: TimeSeries
+            plus and cross polarizations
+        """
+        if self.bank is not None and self.bank.covers(
+                approximant,mass1,mass2,coa_phase,delta_t,f_lower):
+            hp,hc,epoch = self.bank.get(mass1,mass2)
+            with self._lock:
+                self.bank_hits += 1
+            epoch = lal.LIGOTimeGPS(*epoch)
+            # zero-copy: the series wrap the bank's read-only memory map
+            return (
+                TimeSeries(hp,delta_t=delta_t,epoch=epoch,copy=False),
+                TimeSeries(hc,delta_t=delta_t,epoch=epoch,copy=False),
+            )
+
+        key = self.key(approximant,mass1,mass2,coa_phase,delta_t,f_lower)
+        entry = self._lookup(key)
+        if entry is None:
+            hp,hc = get_td_waveform(approximant=approximant,
+                mass1=mass1,
+                mass2=mass2,
+                coa_phase=coa_phase,
+                delta_t=delta_t,
+                f_lower=f_lower)
+            entry = dict(
+                hp = np.array(hp.numpy()),
+                hc = np.array(hc.numpy()),
+                delta_t = float(hp.delta_t),
+                epoch = (int(hp.start_time.gpsSeconds),int(hp.start_time.gpsNanoSeconds)),
+            )
+            for name in ('hp','hc'):
+                entry[name].flags.writeable = False
+            self._store(key,entry)
+
+        epoch = lal.LIGOTimeGPS(*entry['epoch'])
+        return (
+            TimeSeries(entry['hp'],delta_t=entry['delta_t'],epoch=epoch,copy=True),
+            TimeSeries(entry['hc'],delta_t=entry['delta_t'],epoch=epoch,copy=True),
+        )